@@ -0,0 +1,46 @@
+"""
+Import-time benchmark: for each module, import it in a fresh interpreter with
+`-X importtime` and report its cumulative import time (best of `--repeats`), and
+which of the heavy optional backends (NumPy, bitstring, more_itertools) it loaded.
+
+    python -m benchmarks.bench_import --repeats 5
+
+Compile the bytecode first (`python -m compileall -f ord_pset`) if it isn't being
+written (e.g. under `PYTHONDONTWRITEBYTECODE`), or compilation will be timed too.
+"""
+from subprocess import run
+import argparse
+import sys
+
+MODULES = [
+    "ord_pset.__main__",
+    "ord_pset.pset_partitions",
+    "ord_pset.bit_strings",
+    "ord_pset.ranking",
+    "ord_pset.xor_delta",
+    "ord_pset.string_powerset",
+]
+HEAVY = ["numpy", "bitstring", "more_itertools"]
+
+
+def import_time(module):
+    "Return the cumulative import time of `module` (in µs) and the heavy modules loaded"
+    code = f"import sys, {module}; print(*[m for m in {HEAVY!r} if m in sys.modules])"
+    proc = run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    for line in proc.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]), proc.stdout.split()
+    raise ValueError(f"No import time reported for {module}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'module':<28} {'ms':>8}  heavy imports")
+    for module in args.modules:
+        results = [import_time(module) for _ in range(args.repeats)]
+        best = min(us for us, _ in results)
+        print(f"{module:<28} {best / 1000:>8.2f}  {', '.join(results[0][1]) or '-'}")
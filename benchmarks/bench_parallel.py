@@ -0,0 +1,46 @@
+"""
+Scaling benchmark for `ord_pset.parallel.write_bitmasks_parallel`: time writing
+the packed bitmasks of the ordered powerset of `n` items to a null sink with an
+increasing number of worker processes, and report the speedup over one worker.
+
+    python -m benchmarks.bench_parallel -n 24 --workers 1 2 4 8
+"""
+from ord_pset.parallel import write_bitmasks_parallel
+from os import cpu_count
+from time import perf_counter
+import argparse
+
+
+class NullSink:
+    "File-like sink which only counts the bytes written to it"
+    def __init__(self):
+        self.nbytes = 0
+
+    def write(self, b):
+        self.nbytes += len(b)
+
+
+def bench(n, workers, repeats=1):
+    best = None
+    for _ in range(repeats):
+        sink = NullSink()
+        t0 = perf_counter()
+        written = write_bitmasks_parallel(n, sink, max_workers=workers)
+        elapsed = perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return written, best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=22, help="Number of items")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeats", type=int, default=1)
+    args = parser.parse_args()
+    print(f"n={args.n}, {cpu_count()} CPUs available")
+    print(f"{'workers':>8} {'seconds':>10} {'subsets/s':>14} {'speedup':>8}")
+    baseline = None
+    for w in args.workers:
+        written, elapsed = bench(args.n, w, args.repeats)
+        baseline = baseline or elapsed
+        print(f"{w:>8} {elapsed:>10.3f} {written / elapsed:>14,.0f} {baseline / elapsed:>8.2f}")
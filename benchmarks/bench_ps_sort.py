@@ -0,0 +1,55 @@
+"""
+Benchmark generating the `ps_sorter` (length, gap sequence) order of the powerset
+of `range(n)`: sorting `more_itertools.powerset` with `ps_sorter` (as in
+`ord_pset/more_itertools_ps_sort.py`), sorting each level's block of subsets with
+`lexsort_gap_order`, and generating it directly with `iter_gap_ordered_powerset`.
+
+    python -m benchmarks.bench_ps_sort -n 10 14 16 --max-sorted-n 16
+"""
+from ord_pset.gap_order import iter_gap_ordered_powerset, lexsort_gap_order
+from ord_pset.more_itertools_ps_sort import ps_sorter
+from itertools import combinations
+from more_itertools import powerset
+from time import perf_counter
+import argparse
+import numpy as np
+
+
+def sorted_ps(n):
+    return sorted(powerset(range(n)), key=ps_sorter)
+
+
+def lexsorted_ps(n):
+    subsets = [()]
+    for r in range(1, n + 1):
+        block = np.array(list(combinations(range(n), r)), dtype=np.intp)
+        subsets.extend(map(tuple, lexsort_gap_order(block).tolist()))
+    return subsets
+
+
+def direct_ps(n):
+    return list(iter_gap_ordered_powerset(range(n)))
+
+
+def bench(fn, n):
+    t0 = perf_counter()
+    subsets = fn(n)
+    return subsets, perf_counter() - t0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, nargs="+", default=[10, 14, 16, 18])
+    parser.add_argument("--max-sorted-n", type=int, default=16,
+        help="Largest n to time the `ps_sorter` sort at (one NumPy call per subset)")
+    args = parser.parse_args()
+    print(f"{'n':>3} {'method':>10} {'seconds':>10} {'subsets/s':>14}")
+    for n in args.n:
+        expected = None
+        for name, fn in [("sorted", sorted_ps), ("lexsort", lexsorted_ps), ("direct", direct_ps)]:
+            if name == "sorted" and n > args.max_sorted_n:
+                continue
+            subsets, elapsed = bench(fn, n)
+            expected = expected or subsets
+            assert subsets == expected, f"{name} order differs at n={n}"
+            print(f"{n:>3} {name:>10} {elapsed:>10.3f} {len(subsets) / elapsed:>14,.0f}")
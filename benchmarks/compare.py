@@ -0,0 +1,52 @@
+"""
+Compare two benchmark suite result files (from `benchmarks.suite`), reporting the
+speed and peak memory ratio of the new results to the old for each case and `n`
+in both, and flagging the cases which got slower by more than `--threshold`.
+
+    python -m benchmarks.compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+from pathlib import Path
+import argparse
+import json
+
+
+def load(path):
+    data = json.loads(Path(path).read_text())
+    # results from before the cache state was recorded were measured warm
+    cache = data.get("partition_cache", "warm")
+    return data["commit"], cache, {(r["case"], r["n"]): r for r in data["results"]}
+
+
+def compare(old, new, threshold=0.1):
+    "Return `(case, n, old seconds, new seconds, speedup, memory ratio, regressed)` rows"
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        o, r = old[key], new[key]
+        speedup = o["seconds"] / r["seconds"] if r["seconds"] else None
+        memory = r["peak_bytes"] / o["peak_bytes"] if o["peak_bytes"] and r["peak_bytes"] else None
+        regressed = speedup is not None and speedup < 1 / (1 + threshold)
+        rows.append((*key, o["seconds"], r["seconds"], speedup, memory, regressed))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1,
+        help="Fractional slowdown reported as a regression")
+    args = parser.parse_args()
+    old_commit, old_cache, old = load(args.old)
+    new_commit, new_cache, new = load(args.new)
+    print(f"{old_commit} → {new_commit}")
+    if old_cache != new_cache:
+        print(f"Warning: comparing a {old_cache} partition cache with a {new_cache} one")
+    print(f"{'case':<28} {'n':>3} {'old s':>10} {'new s':>10} {'speedup':>8} {'memory':>8}")
+    rows = compare(old, new, args.threshold)
+    for case, n, old_s, new_s, speedup, memory, regressed in rows:
+        speedup_str = "-" if speedup is None else f"{speedup:.2f}x"
+        memory_str = "-" if memory is None else f"{memory:.2f}x"
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{case:<28} {n:>3} {old_s:>10.4f} {new_s:>10.4f} {speedup_str:>8} {memory_str:>8}{flag}")
+    if any(row[-1] for row in rows):
+        raise SystemExit(1)
@@ -0,0 +1,172 @@
+"""
+Benchmark suite: scaling curves of the powerset generators, the partition
+enumeration, the bitstream encoders and the `more_itertools.powerset` + `ps_sorter`
+baseline over the number of items `n`. Each case is timed (best of `--repeats`),
+then run once more under `tracemalloc` for its peak memory, and the results are
+saved as JSON (one file per commit) to compare with `benchmarks.compare`.
+
+    python -m benchmarks.suite -n 10 14 18 22 26 --max-seconds 30
+    python -m benchmarks.suite --cases generate_powerset/tuple --no-memory
+
+A case stops scaling once a run takes longer than `--max-seconds` (or beyond the
+case's own largest `n`, for those which hold every subset in memory at once).
+
+Every run (timed or traced) starts with the process-wide partition table cache
+cleared, so `generate_powerset` is measured cold, including the partition
+enumeration (as it was before the cache existed); `--warm` measures it with the
+table already cached instead. Each result records which (`partition_cache`).
+"""
+from more_itertools import powerset
+from ord_pset.bit_strings import bitstream_ins
+from ord_pset.more_itertools_ps_sort import ps_sorter
+from ord_pset.partition_cache import default_cache
+from ord_pset.pset_partitions import (
+    asc_int_partitions,
+    bitmask_handler,
+    generate_powerset,
+    partitions_by_length,
+    string_handler,
+    uniquely_permute,
+)
+from datetime import datetime, timezone
+from pathlib import Path
+from subprocess import run
+from time import perf_counter
+import argparse
+import json
+import platform
+import string
+import tracemalloc
+
+RESULTS_DIR = Path(__file__).parent / "results"
+ITEMS = string.ascii_letters
+
+
+def _generate(handler, letters=False):
+    def case(n):
+        items = list(ITEMS[:n]) if letters else list(range(n))
+        ps = generate_powerset(items, subset_handler=handler)
+        return sum(map(len, ps.values()))
+    return case
+
+
+def _asc_int_partitions(n):
+    return sum(1 for _ in asc_int_partitions(n))
+
+
+def _partitions_by_length(n):
+    return sum(map(len, partitions_by_length(n - 1, permuting=True).values()))
+
+
+def _uniquely_permute(n):
+    # every composition of n - 1, i.e. 2**(n-2) permutations
+    return sum(1 for p in asc_int_partitions(n - 1) for _ in uniquely_permute(p))
+
+
+def _bitstream(mode):
+    def case(n):
+        bitstream_ins(n=2**n, raw=True, **mode)
+        return 2**n
+    return case
+
+
+def _ps_sorter_baseline(n):
+    return len(sorted(powerset(range(n)), key=ps_sorter))
+
+
+# name: (function of n returning the number of items produced, largest n)
+CASES = {
+    "generate_powerset/tuple": (_generate(tuple), 22),
+    "generate_powerset/string": (_generate(string_handler, letters=True), 22),
+    "generate_powerset/bitmask": (_generate(bitmask_handler), 22),
+    "asc_int_partitions": (_asc_int_partitions, 60),
+    "partitions_by_length": (_partitions_by_length, 22),
+    "uniquely_permute": (_uniquely_permute, 26),
+    "bitstream_ins/lossless": (_bitstream({}), 24),
+    "bitstream_ins/lencode": (_bitstream({"lencode": True}), 24),
+    "bitstream_ins/fixed_length": (_bitstream({"fixed_length": True}), 24),
+    "ps_sorter_baseline": (_ps_sorter_baseline, 18),
+}
+
+
+def _prepare_cache(fn, n, warm):
+    "Clear the partition table cache, then (if `warm`) fill it by running `fn(n)` once"
+    default_cache.clear()
+    if warm:
+        fn(n)
+
+
+def measure(fn, n, repeats, memory, warm=False):
+    """
+    Return the best wall time, item count and (optionally) tracemalloc peak of
+    `fn(n)`, each run starting from a cold (or if `warm`, filled) partition cache
+    """
+    seconds = None
+    for _ in range(repeats):
+        _prepare_cache(fn, n, warm)
+        t0 = perf_counter()
+        count = fn(n)
+        elapsed = perf_counter() - t0
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    peak = None
+    if memory:
+        _prepare_cache(fn, n, warm)
+        tracemalloc.start()
+        fn(n)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    default_cache.clear()
+    return seconds, count, peak
+
+
+def git_commit():
+    proc = run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    return proc.stdout.strip() or "unknown"
+
+
+def run_suite(cases, ns, repeats=1, memory=True, max_seconds=10.0, warm=False):
+    results = []
+    for name in cases:
+        fn, max_n = CASES[name]
+        for n in sorted(ns):
+            if n > max_n:
+                break
+            seconds, count, peak = measure(fn, n, repeats, memory, warm)
+            result = {
+                "case": name, "n": n, "seconds": seconds, "count": count,
+                "per_second": count / seconds if seconds else None, "peak_bytes": peak,
+                "partition_cache": "warm" if warm else "cold",
+            }
+            results.append(result)
+            peak_mib = "-" if peak is None else f"{peak / 2**20:.1f}"
+            print(f"{name:<28} {n:>3} {seconds:>10.4f} {result['per_second'] or 0:>14,.0f} {peak_mib:>10}")
+            if seconds > max_seconds:
+                break
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, nargs="+", default=list(range(10, 27, 2)))
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    parser.add_argument("--warm", action="store_true",
+        help="Measure with the partition table already cached (default: cold)")
+    parser.add_argument("-o", "--output", type=Path, help="JSON file (default: results/<commit>.json)")
+    args = parser.parse_args()
+    commit = git_commit()
+    print(f"{'case':<28} {'n':>3} {'seconds':>10} {'items/s':>14} {'peak MiB':>10}")
+    results = run_suite(args.cases, args.n, args.repeats, args.memory, args.max_seconds, args.warm)
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "partition_cache": "warm" if args.warm else "cold",
+        "results": results,
+    }, indent=1))
+    print(f"Saved {output}")
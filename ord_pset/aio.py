@@ -0,0 +1,73 @@
+from ord_pset.pset_partitions import iter_powerset
+from itertools import islice
+import asyncio
+import threading
+
+# Async iteration over the ordered powerset in batches, for use in asyncio
+# services. By default the batches are generated in the event loop's thread, which
+# is handed back to the loop after every batch (so `batch_size` trades throughput
+# for latency). With `threaded=True` the generation runs in an executor thread and
+# the batches are passed through a bounded queue: once `max_pending` batches are
+# waiting the generator blocks until the consumer catches up (backpressure), and
+# it stops as soon as the consumer does.
+
+_DONE = object()
+
+def _iter_batches(items, batch_size, subset_handler, filters):
+    subsets = iter_powerset(items, subset_handler, **filters)
+    while True:
+        batch = list(islice(subsets, batch_size))
+        if not batch:
+            return
+        yield batch
+
+async def aiter_powerset(items, batch_size=1024, subset_handler=tuple, threaded=False,
+    executor=None, max_pending=4, **filters):
+    """
+    Asynchronously generate the powerset of `items` (in the order of
+    `iter_powerset`, with any of its `filters`) as lists of up to `batch_size`
+    subsets, yielding to the event loop between batches. If `threaded`, the batches
+    are generated in `executor` (the loop's default executor if None) with at most
+    `max_pending` of them queued ahead of the consumer.
+    """
+    batches = _iter_batches(items, batch_size, subset_handler, filters)
+    if not threaded:
+        for batch in batches:
+            yield batch
+            await asyncio.sleep(0)
+        return
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    return
+                # blocks this thread while the queue is full
+                asyncio.run_coroutine_threadsafe(queue.put(batch), loop).result()
+        except BaseException as e:
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(e), loop).result()
+            return
+        if not stop.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(_DONE), loop).result()
+
+    producer = loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is _DONE:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+            yield batch
+    finally:
+        stop.set()
+        # unblock a producer waiting to put into a full queue, so it sees the stop
+        while not producer.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.wait([producer], timeout=0.01)
+        await producer
@@ -1,6 +1,23 @@
-from bitstring import Bits, BitStream, pack
-from math import ceil, floor, log2 #, frexp
-from more_itertools import all_equal
+from itertools import accumulate, repeat
+from math import ceil, comb, floor, log2 #, frexp
+from ord_pset.pset_partitions import iter_level_partitions
+from threading import Lock
+import sys
+
+# `bitstring` (like NumPy) is only imported on first use, so that importing this
+# module (e.g. for the raw `(bytearray, bit length)` encoders) costs no more than
+# the stdlib. Its `Bits`, `BitStream` and `pack` are still importable from here.
+
+def __getattr__(name):
+    if name in ("Bits", "BitStream", "pack"):
+        import bitstring
+        return getattr(bitstring, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def is_bits(source):
+    "Whether `source` is a `bitstring.Bits` (which it can't be if it's not imported)"
+    bitstring = sys.modules.get("bitstring")
+    return bitstring is not None and isinstance(source, bitstring.Bits)
 
 def bitstr_len(n):
     """
@@ -46,7 +63,7 @@ def bitstr_lencoded_value_offset(n):
     # see https://stackoverflow.com/a/28033134/2668831
     return 2**(bitstr_len_lencoded(n)) - 2
 
-def bitstream_ins(iterable=None, n=None, bstream=None, fixed_length=False, lencode=False, v=False):
+def bitstream_ins(iterable=None, n=None, bstream=None, fixed_length=False, lencode=False, v=False, raw=False):
     """
     Return a BitStream representation of `iterable` by repeated insertions.
     `iterable` should be an iterable of integers, such as from `range(n)`.
@@ -76,21 +93,31 @@ def bitstream_ins(iterable=None, n=None, bstream=None, fixed_length=False, lenco
 
     Print progress information on the range being created and individual insertions
     (integer, length) if the verbosity parameter `v` is True.
+
+    The codewords are packed into bytes through an integer accumulator (or with
+    NumPy, if `iterable` is an integer array) and inserted into the BitStream in a
+    single insertion, or returned as the raw `(bytearray, bit length)` if `raw`.
     """
     assert not (lencode and fixed_length), ValueError("Can't lencode fixed length")
+    is_array = hasattr(iterable, "dtype")
     if n is None:
         assert not iterable is None, ValueError("Must provide iterable or n")
         n = len(iterable)
-        assert all_equal(map(type, iterable)), TypeError("iterable of mixed types")
-        if n > 0:
-            msg = "Not an iterable of `int`s: omit & provide `n=len(iterable)` instead"
-            assert isinstance(iterable[0], int), TypeError(msg)
+        if is_array:
+            assert iterable.dtype.kind in "ui", TypeError("Not an array of integers")
+        else:
+            assert len(set(map(type, iterable))) <= 1, TypeError("iterable of mixed types")
+            if n > 0:
+                msg = "Not an iterable of `int`s: omit & provide `n=len(iterable)` instead"
+                assert isinstance(iterable[0], int), TypeError(msg)
     else:
         assert isinstance(n, int), TypeError("n must be an integer")
         assert not n < 0, ValueError("n cannot be negative")
+    if not raw:
+        from bitstring import Bits, BitStream
     if n == 0:
         # void iterator from 0-length `iterable` or `n=0` always gives empty bitstring
-        return BitStream() # BitStream("").bin is BitStream().bin
+        return (bytearray(), 0) if raw else BitStream() # BitStream("").bin is BitStream().bin
     lenfunc = bitstr_len_lencoded if lencode else bitstr_len
     if fixed_length:
         if iterable is None:
@@ -101,79 +128,459 @@ def bitstream_ins(iterable=None, n=None, bstream=None, fixed_length=False, lenco
         else:
             # Can't see how to check maximum value needed for max_l other than iterating
             max_val = max(iterable)
+            max_l = lenfunc(int(max_val))
     bit_seq = range(n) if iterable is None else iterable
+    if is_array and v:
+        # the verbose (per-codeword) path needs Python ints, for `int.bit_length`
+        bit_seq = iterable.tolist()
     if v:
         print(f"Initialising stream on {bit_seq}")
-    if bstream is None:
-        bstream = BitStream()
-    assert isinstance(bstream, BitStream), TypeError("bstream ≠ bitstring⠶BitStream")
-    if fixed_length:
+    if not raw:
+        if bstream is None:
+            bstream = BitStream()
+        assert isinstance(bstream, BitStream), TypeError("bstream ≠ bitstring⠶BitStream")
+    if is_array and not v:
+        packed, nbits = pack_array_codewords(
+            iterable, fixed_length=max_l if fixed_length else None, lencode=lencode
+        )
+    elif iterable is None and not v:
+        packed, nbits = pack_codewords(_range_codewords(n, fixed_length and max_l, lencode))
+    else:
+        packed, nbits = pack_codewords(_codewords(bit_seq, lenfunc, fixed_length and max_l, lencode, v))
+    if raw:
+        return packed, nbits
+    bstream.insert(Bits(bytes=bytes(packed), length=nbits))
+    return bstream
+
+def _codewords(bit_seq, lenfunc, max_l, lencode, v):
+    """
+    Generate the `(value, length)` codewords of `bit_seq` for `bitstream_ins`, with
+    every length `max_l` if it is given (i.e. for `fixed_length`), printing each
+    insertion if `v` is True.
+    """
+    if max_l:
         for b in bit_seq: # `range(n)` or `iterable`
             if v:
                 print(f"Inserting {b} at length {max_l}")
-            insert_into_bitstream(bstream, b, max_l)
+            yield b, max_l
+    elif lencode:
+        bit_length_counter = bin_readout_offset = 0 # initialise counts
+        for b in bit_seq: # `range(n)` or `iterable`
+            if b > 1:
+                # no mantissa, int(log2(b+2)) via stackoverflow.com/a/28033134/
+                # log2(b+2)-1 gives the count of the run of `l`-length codewords
+                # or equivalently the power of the Mersenne prime max. codeword
+                # length `l`, e.g. 2^(3)-1 = 7, 7 is the max. lencoded codeword
+                # length `l=3` (i.e. in binary 7 is `111`).
+                ###l2bp2 = (b+2).bit_length()-1 # l2bp2 means "log2 b plus 2"
+                l2bp2 = bitstr_len_lencoded(b)
+                if l2bp2 > bit_length_counter: # b = 2,6,14,30,...
+                    bit_length_counter = l2bp2
+                    bin_readout_offset = 2**bit_length_counter - 2
+                # (the rest) b = 3,4,5, 7,...,13, 15...29, 31,...
+                l = lenfunc(b) # assign l based on 'true' (decoded) value
+                # decoded value minus offset = encoded value
+                b -= bin_readout_offset # reassign rather than making
+                assert b >= 0, ValueError("Can't lencode a value after a longer codeword")
+            else: # (b < 2) are not modified by 'lencoding'
+                # fall thru without counter++ or `b -= bin_readout_offset`
+                l = lenfunc(b)
+            if v:
+                print(f"Inserting {b} at length {l}")
+            yield b, l
     else:
+        for b in bit_seq: # `range(n)` or `iterable`
+            l = lenfunc(b)
+            if v:
+                print(f"Inserting {b} at length {l}")
+            yield b, l
+
+def iter_codewords(values, width=None, lencode=False):
+    """
+    Generate the `(value, length)` codewords which `bitstream_ins` encodes the
+    integers `values` as (for `pack_codewords`), every one `width` bits long if
+    given (as for `fixed_length`, whose width `bitstream_ins` sets from the maximum).
+    """
+    assert not (lencode and width), ValueError("Can't lencode fixed length")
+    lenfunc = bitstr_len_lencoded if lencode else bitstr_len
+    return _codewords(values, lenfunc, width, lencode, False)
+
+def _range_codewords(n, max_l, lencode):
+    """
+    Generate the same codewords as `_codewords` for `range(n)`, in runs of equal
+    length (all `max_l` long if given, else from `2^(l-1)` to `2^l - 1` for lossless
+    or from `2^l - 2` to `2^(l+1) - 3` for lencoded codewords of length `l`), so no
+    per-value length function calls are needed.
+    """
+    if max_l:
+        yield from zip(range(n), repeat(max_l))
+        return
+    yield from zip(range(min(n, 2)), repeat(1))
+    l = 1
+    while True:
         if lencode:
-            if iterable is None:
-                bit_length_counter = bin_readout_offset = 0 # initialise counts
-                for b in bit_seq: # `range(n)`
-                    if b > 1:
-                        ###l2bp2 = (b+2).bit_length()-1 # l2bp2 means "log2 b plus 2"
-                        l2bp2 = bitstr_len_lencoded(b)
-                        if l2bp2 > bit_length_counter: # b = 2,6,14,30,...
-                            bit_length_counter = l2bp2
-                            bin_readout_offset = 2**bit_length_counter - 2
-                        # (the rest) b = 3,4,5, 7,...,13, 15...29, 31,...
-                        l = lenfunc(b) # assign l based on 'true' (decoded) value
-                        # decoded value minus offset = encoded value
-                        b -= bin_readout_offset # reassign rather than making
-                    else: # (b < 2) are not modified by 'lencoding'
-                        # fall thru without counter++ or `b -= bin_readout_offset`
-                        l = lenfunc(b)
-                    if v:
-                        print(f"Inserting {b} at length {l}")
-                    insert_into_bitstream(bstream, b, l)
-            else:
-                bit_length_counter = bin_readout_offset = 0 # initialise counts
-                for b in bit_seq: # `range(n)`
-                    if b > 1:
-                        # no mantissa, int(log2(b+2)) via stackoverflow.com/a/28033134/
-                        # log2(b+2)-1 gives the count of the run of `l`-length codewords
-                        # or equivalently the power of the Mersenne prime max. codeword
-                        # length `l`, e.g. 2^(3)-1 = 7, 7 is the max. lencoded codeword
-                        # length `l=3` (i.e. in binary 7 is `111`).
-                        ###l2bp2 = (b+2).bit_length()-1 # l2bp2 means "log2 b plus 2"
-                        l2bp2 = bitstr_len_lencoded(b)
-                        if l2bp2 > bit_length_counter: # b = 2,6,14,30,...
-                            bit_length_counter = l2bp2
-                            bin_readout_offset = 2**bit_length_counter - 2
-                        # (the rest) b = 3,4,5, 7,...,13, 15...29, 31,...
-                        l = lenfunc(b) # assign l based on 'true' (decoded) value
-                        # decoded value minus offset = encoded value
-                        b -= bin_readout_offset # reassign rather than making
-                    else: # (b < 2) are not modified by 'lencoding'
-                        # fall thru without counter++ or `b -= bin_readout_offset`
-                        l = lenfunc(b)
-                    if v:
-                        print(f"Inserting {b} at length {l}")
-                    insert_into_bitstream(bstream, b, l)
+            start, stop = 2**l - 2, 2**(l+1) - 2 # offset 2^l - 2 from the values
         else:
-            for b in bit_seq: # `range(n)` or `iterable`
-                l = lenfunc(b)
-                if v:
-                    print(f"Inserting {b} at length {l}")
-                insert_into_bitstream(bstream, b, l)
-    return bstream
+            start, stop = 2**(l-1), 2**l
+        start = max(start, 2)
+        if start >= n:
+            return
+        offset = 2**l - 2 if lencode else 0
+        yield from zip(range(start - offset, min(stop, n) - offset), repeat(l))
+        l += 1
+
+def pack_codewords(codewords, flush_bits=256):
+    """
+    Pack an iterable of `(value, length)` codewords into bytes, most significant
+    bit first, returning the `(bytearray, bit length)` (the final byte is right
+    padded with zeros). The codewords are shifted into an integer accumulator which
+    is flushed to the bytearray (in whole bytes) every `flush_bits` bits or so.
+    """
+    buf = bytearray()
+    acc = acc_bits = nbits = 0
+    for b, l in codewords:
+        acc = (acc << l) | b
+        acc_bits += l
+        if acc_bits >= flush_bits:
+            spare = acc_bits & 7
+            buf += (acc >> spare).to_bytes(acc_bits >> 3, "big")
+            nbits += acc_bits - spare
+            acc &= (1 << spare) - 1
+            acc_bits = spare
+    if acc_bits:
+        pad = -acc_bits % 8
+        buf += (acc << pad).to_bytes((acc_bits + pad) >> 3, "big")
+        nbits += acc_bits
+    return buf, nbits
+
+def join_bit_pieces(pieces):
+    """
+    Concatenate an iterable of packed `(bytes, bit length)` bitstreams (as from
+    `pack_codewords`, each right padded to a whole byte) into one, at their bit
+    boundaries rather than byte boundaries, returning the `(bytearray, bit length)`.
+    Each piece is shifted (as an integer) past the spare bits of the last, so the
+    cost is linear in the total length.
+    """
+    buf = bytearray()
+    carry = carry_bits = nbits = 0
+    for piece, piece_bits in pieces:
+        if not piece_bits:
+            continue
+        value = int.from_bytes(piece, "big") >> (8 * len(piece) - piece_bits)
+        value |= carry << piece_bits
+        total = carry_bits + piece_bits
+        carry_bits = total & 7
+        buf += (value >> carry_bits).to_bytes(total >> 3, "big")
+        carry = value & ((1 << carry_bits) - 1)
+        nbits += piece_bits
+    if carry_bits:
+        buf.append(carry << (8 - carry_bits))
+    return buf, nbits
+
+def _array_bit_lengths(values):
+    "Vectorised `int.bit_length` of a NumPy array of unsigned integers"
+    import numpy as np
+    values = values.astype(np.uint64)
+    lengths = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        over = values >= np.uint64(1 << shift)
+        lengths += over * shift
+        values = np.where(over, values >> np.uint64(shift), values)
+    return lengths + (values > 0)
+
+def pack_array_codewords(values, fixed_length=None, lencode=False, chunk_size=2**16):
+    """
+    Vectorised `pack_codewords` for a NumPy integer array of `values` (each < 2⁶³),
+    with codeword lengths and values as in `bitstream_ins` (all `fixed_length` bits
+    long if that is given). Bits are expanded and packed with `np.packbits` in
+    chunks of `chunk_size` values.
+    """
+    import numpy as np
+    values = np.asarray(values).astype(np.int64)
+    if fixed_length:
+        lengths = np.full(len(values), fixed_length, dtype=np.int64)
+    elif lencode:
+        lengths = _array_bit_lengths(values + 2) - 1
+        # offsets from the longest codeword length seen so far (among `b > 1`)
+        counters = np.maximum.accumulate(np.where(values > 1, lengths, 0))
+        values = np.where(values > 1, values - (2**counters - 2), values)
+        assert (values >= 0).all(), ValueError("Can't lencode a value after a longer codeword")
+    else:
+        lengths = np.maximum(1, _array_bit_lengths(values))
+    max_l = int(lengths.max())
+    columns = np.arange(max_l)
+    shifts = (max_l - 1 - columns).astype(np.int64)
+    buf = bytearray()
+    carry = np.zeros(0, dtype=np.uint8)
+    for start in range(0, len(values), chunk_size):
+        v, l = values[start:start + chunk_size], lengths[start:start + chunk_size]
+        bits = ((v[:, None] >> shifts) & 1).astype(np.uint8)
+        bits = np.concatenate([carry, bits[columns >= (max_l - l)[:, None]]])
+        whole = len(bits) - len(bits) % 8
+        buf += np.packbits(bits[:whole]).tobytes()
+        carry = bits[whole:]
+    buf += np.packbits(carry).tobytes()
+    return buf, int(lengths.sum())
 
 def insert_into_bitstream(bs, n, l):
     "Insert the integer `n` as an `l`-length bit into the bitstream `bs`"
     bs.insert(f"{l}={n}")
     return
 
+def _iter_source_blocks(source, read_size):
+    "Generate the bytes of `source` (bytes-like, file object or Bits) in blocks"
+    if is_bits(source): # n.b. a BitStream also has a `read` method
+        source = source.tobytes()
+    if hasattr(source, "read"):
+        while True:
+            block = source.read(read_size)
+            if not block:
+                return
+            yield memoryview(block)
+    else:
+        view = memoryview(source).cast("B")
+        for start in range(0, len(view), read_size):
+            yield view[start:start + read_size]
+
+class BitReader:
+    """
+    Read integers of any bit length (most significant bit first) from `source`,
+    which may be bytes-like, a binary file object (read `read_size` bytes at a
+    time) or a `Bits`/`BitStream`. Bits are taken into a small integer accumulator
+    up to 8 bytes at a time, so reads cost the same however long the source is.
+    """
+    def __init__(self, source, read_size=2**16):
+        self._blocks = _iter_source_blocks(source, read_size)
+        self._block = memoryview(b"")
+        self._pos = 0
+        self._acc = 0
+        self._acc_bits = 0
+
+    def read(self, l):
+        "Read the next `l` bits as an unsigned integer"
+        while self._acc_bits < l:
+            if self._pos >= len(self._block):
+                self._block = next(self._blocks, None)
+                assert self._block is not None, ValueError("Bitstream ended early")
+                self._pos = 0
+            word = self._block[self._pos:self._pos + 8]
+            self._pos += 8
+            self._acc = (self._acc << (8 * len(word))) | int.from_bytes(word, "big")
+            self._acc_bits += 8 * len(word)
+        self._acc_bits -= l
+        value = self._acc >> self._acc_bits
+        self._acc &= (1 << self._acc_bits) - 1
+        return value
+
+def _range_length_runs(fixed_length, lencode, width):
+    """
+    Generate `(count, length, offset)` runs of the codewords of `range(n)` (for any
+    `n`), where the decoded value is the `length`-bit codeword plus `offset`.
+    """
+    if fixed_length:
+        yield None, width, 0 # a single unbounded run
+        return
+    yield 2, 1, 0
+    l = 2
+    while True:
+        if lencode:
+            yield 2**l, l, 2**l - 2
+        else:
+            yield 2**(l-1), l, 0
+        l += 1
+
+def iter_bitstream_ints(source, n=None, fixed_length=False, lencode=False, width=None,
+        nbits=None, chunk_size=4096, read_size=2**16):
+    """
+    Decode a bitstream from `bitstream_ins` back into integers, yielding them in
+    lists of up to `chunk_size`. The `source` may be bytes, a `bytearray`, a
+    `memoryview`, a binary file object (read `read_size` bytes at a time) or a
+    `Bits`/`BitStream`, and it is never converted to a `.bin` string, so memory
+    use is bounded however long the stream.
+
+    Lossless and lencoded codewords are not uniquely decodable in general, but for
+    the encoding of `range(n)` their lengths are known from their position (from
+    `bitstr_len` and `bitstr_len_lencoded`), so those streams are decoded as such.
+    A `fixed_length` stream may hold any integers, all `width` bits long (which
+    defaults to the codeword length `bitstream_ins(n=n, fixed_length=True)` uses).
+
+    Decoding stops after `n` integers, or when fewer than the next codeword's bits
+    remain of the `nbits` in the stream (the padding of a byte stream is otherwise
+    indistinguishable from data, so one of these must be given unless `source` is
+    a `Bits` object, whose length is used).
+    """
+    assert not (lencode and fixed_length), ValueError("Can't lencode fixed length")
+    if nbits is None and is_bits(source):
+        nbits = source.len
+    assert not (n is None and nbits is None), ValueError("Must provide n or nbits")
+    if fixed_length and width is None:
+        assert n is not None, ValueError("Must provide width or n")
+        width = bitstr_len(n-1) if n > 2 else 1
+    remaining = n
+    bits_left = nbits
+    reader = BitReader(source, read_size)
+    chunk = []
+    for count, l, offset in _range_length_runs(fixed_length, lencode, width):
+        if remaining is not None:
+            count = remaining if count is None else min(count, remaining)
+        if bits_left is not None:
+            fit = bits_left // l
+            count = fit if count is None else min(count, fit)
+        read = reader.read
+        for _ in repeat(None, count):
+            chunk.append(read(l) + offset)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if remaining is not None:
+            remaining -= count
+        if bits_left is not None:
+            bits_left -= count * l
+        if remaining == 0 or (bits_left is not None and bits_left < l + 1):
+            break
+    if chunk:
+        yield chunk
+
+def iter_toggle_codewords(n, p_len):
+    """
+    Generate the `n`-bit characteristic vectors ("toggles") of the subsets at level
+    `p_len` of the ordered powerset of `n` items (excluding the empty set from level
+    0) as integers whose most significant bit is the first item, i.e. the same bits
+    as `Bits([i in subset for i in range(n)])`. Each partition's run of subsets is
+    one codeword shifted right by each offset in the sweep.
+    """
+    top = 1 << (n - 1)
+    if p_len == 0:
+        yield from (top >> offset for offset in range(n))
+        return
+    for partition in iter_level_partitions(n, p_len):
+        toggle = 0
+        for i in accumulate(partition, initial=0):
+            toggle |= top >> i
+        yield from (toggle >> offset for offset in range(n - sum(partition)))
+
+def toggle_bitstream(n, empty=False, raw=False):
+    """
+    Return the characteristic ("toggle") vectors of the ordered powerset of `n`
+    items, `n` bits per subset, packed straight into a single BitStream (or the raw
+    `(bytearray, bit length)` if `raw`), along with the bit offsets at which each
+    level of `generate_powerset` starts (followed by the total length).
+
+    The empty set (the all-zero vector) is only included at the start of level 0 if
+    `empty` is True, as the subset lists of `print_combs_gen_pos_to_bintoggle.py`
+    (whose bitstream this reproduces) start at the singletons.
+    """
+    offsets = [0]
+    def codewords():
+        if empty:
+            yield 0, n
+        for p_len in range(n):
+            yield from zip(iter_toggle_codewords(n, p_len), repeat(n))
+            offsets.append(offsets[-1] + n * (comb(n, p_len + 1) + (empty and p_len == 0)))
+    packed, nbits = pack_codewords(codewords())
+    if raw:
+        return (packed, nbits), offsets
+    from bitstring import BitStream
+    return BitStream(bytes=bytes(packed), length=nbits), offsets
+
+def _range_nbits(n, lencode=False, width=None):
+    "Length in bits of the `bitstream_ins` codewords of `range(n)` (all `width` if given)"
+    if width:
+        return n * width
+    nbits = 0
+    for count, l, _ in _range_length_runs(False, lencode, None):
+        if n <= count:
+            return nbits + n * l
+        nbits += count * l
+        n -= count
+
+def _fixed_width(n):
+    "The codeword length of `bitstream_ins(n=n, fixed_length=True)`"
+    return bitstr_len(n-1) if n > 2 else 1
+
+class _GrowingBitstream:
+    """
+    The packed codewords of `range(n)` for one mode (and width), extended in place
+    as `n` grows: the buffer's capacity is doubled when it runs out (into a new
+    bytearray, leaving any views of the old one intact), and otherwise new bytes
+    are written by same-size slice assignment, which is allowed while views of the
+    buffer are held.
+    """
+    def __init__(self, lencode=False, width=None):
+        self.lencode = lencode
+        self.width = width
+        self.n = 0
+        self.nbits = 0
+        self.buf = bytearray(64)
+
+    def extend(self, n):
+        "Encode the values `range(self.n, n)` onto the end of the stream"
+        lenfunc = bitstr_len_lencoded if self.lencode else bitstr_len
+        codewords = _codewords(range(self.n, n), lenfunc, self.width, self.lencode, False)
+        at = self.nbits >> 3
+        spare = self.nbits & 7
+        head = (self.buf[at:at + 1], spare) if spare else (b"", 0)
+        packed, nbits = join_bit_pieces([head, pack_codewords(codewords)])
+        if at + len(packed) > len(self.buf):
+            capacity = len(self.buf)
+            while at + len(packed) > capacity:
+                capacity *= 2
+            grown = bytearray(capacity)
+            grown[:at] = self.buf[:at]
+            self.buf = grown
+        self.buf[at:at + len(packed)] = packed
+        self.n = n
+        self.nbits = at * 8 + nbits
+
+    def view(self, n):
+        "Zero-copy `(memoryview, bit length)` of the codewords of `range(n)`"
+        nbits = _range_nbits(n, self.lencode, self.width)
+        return memoryview(self.buf)[:(nbits + 7) >> 3], nbits
+
+class RangeBitstreamCache:
+    """
+    Shared cache of the `bitstream_ins(n=n)` codewords of `range(n)`, per mode,
+    which relies on each being a prefix of those for any larger `n` (for fixed
+    length codewords, only up to the next power of two, so each width is kept as a
+    separate stream). A request for a larger `n` than cached encodes only the new
+    values onto the end, and a smaller `n` is served as a slice, so repeated
+    requests cost amortised O(change in `n`).
+
+    The `(memoryview, bit length)` returned is a zero-copy view, whose bits past the
+    bit length (in its final byte) may be those of later codewords rather than the
+    zero padding of `bitstream_ins(..., raw=True)`.
+    """
+    def __init__(self):
+        self._streams = {}
+        self._lock = Lock()
+
+    def get(self, n, fixed_length=False, lencode=False):
+        "Return the `(memoryview, bit length)` of the codewords of `range(n)`"
+        assert not (lencode and fixed_length), ValueError("Can't lencode fixed length")
+        assert isinstance(n, int) and n >= 0, ValueError("n must be a non-negative integer")
+        if fixed_length:
+            key = ("fixed_length", _fixed_width(n))
+        else:
+            key = ("lencode" if lencode else "lossless", None)
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _GrowingBitstream(lencode, key[1])
+            if n > stream.n:
+                stream.extend(n)
+            return stream.view(n)
+
+    def clear(self):
+        with self._lock:
+            self._streams.clear()
+
+default_range_cache = RangeBitstreamCache()
+
 ####### Deprecated functions: ##################################################
 
 def bitstream_pack(iterable):
     "(Deprecated) Return a BitStream representation of `iterable` by packing."
+    from bitstring import pack
     l = bitstr_len(iterable)
     bit_range = range(2**l)
     stream_input_str = ",".join(['='.join(map(repr, [l,b])) for b in bit_range])
@@ -192,6 +599,7 @@ def bitstrings_generator(iterable=None, n=None):
         n = len(iterable)
     else:
         assert isinstance(n, int), TypeError("n must be an integer")
+    from bitstring import Bits
     l = bitstr_len(n) # make all bitstrings identical length
     bit_range = range(2**l)
     for b in bit_range:
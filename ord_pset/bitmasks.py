@@ -0,0 +1,62 @@
+from array import array
+from itertools import accumulate
+
+# Subsets of `n` items as integer bitmasks, where item `i` is bit `i` (i.e. the
+# least significant bit is the first item). All of the subsets generated from a
+# partition are then a single mask shifted left by each offset in the sweep.
+
+def bitmask_to_indices(mask):
+    "Return the ascending tuple of item indices set in the integer `mask`"
+    indices = []
+    i = 0
+    while mask:
+        if mask & 1:
+            indices.append(i)
+        mask >>= 1
+        i += 1
+    return tuple(indices)
+
+def indices_to_bitmask(indices):
+    "Return the integer bitmask with the bits of the item `indices` set"
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+def iter_level_bitmasks(n, p_len):
+    """
+    Generate the bitmasks of the subsets at level `p_len` (as in the keys of
+    `generate_powerset`, excluding the empty set from level 0) in order, in runs
+    of one partition's mask shifted by each offset.
+    """
+    # deferred import: `pset_partitions` uses this module's bit convention
+    from ord_pset.pset_partitions import iter_level_partitions
+    if p_len == 0:
+        yield from (1 << offset for offset in range(n))
+        return
+    for partition in iter_level_partitions(n, p_len):
+        mask = indices_to_bitmask(accumulate(partition, initial=0))
+        yield from (mask << offset for offset in range(n - sum(partition)))
+
+def iter_bitmasks(n):
+    "Generate the bitmasks of the ordered powerset of `n` items (in `iter_powerset` order)"
+    yield 0
+    for p_len in range(n):
+        yield from iter_level_bitmasks(n, p_len)
+
+def bitmask_array(n, p_len=None, as_numpy=False):
+    """
+    Return the bitmasks of the ordered powerset of `n` items (or just its level
+    `p_len`) packed in an `array('Q')` of 8 bytes per subset, or as a NumPy `uint64`
+    array (sharing the same buffer) if `as_numpy` is True. Above 64 items the masks
+    cannot be packed and a list of Python ints is returned instead.
+    """
+    masks = iter_bitmasks(n) if p_len is None else iter_level_bitmasks(n, p_len)
+    if n > 64:
+        assert not as_numpy, ValueError("Can't pack bitmasks of more than 64 items")
+        return list(masks)
+    packed = array("Q", masks)
+    if as_numpy:
+        import numpy as np
+        return np.frombuffer(packed, dtype=np.uint64)
+    return packed
@@ -1,39 +1,43 @@
-from itertools import combinations
-import numpy as np
+from ord_pset.gap_order import iter_gap_sequences
+from itertools import accumulate, combinations
 
-items = list("abcdef")
-c_dict = dict()
-uc_dict = dict()
+# The `r`-combinations of `items` ordered by the smallest gap between successive
+# (positions of) items, then by the sequence of gaps, then by offset, i.e. as if
+# `combinations(items, r)` were stably sorted by `max_diff_min`. This is generated
+# directly: for each minimum gap `m`, the gap sequences with every gap at least `m`
+# are enumerated in lexicographic order, keeping those with a gap equal to `m`.
 
-def max_diff_min(itemstr):
-    indexes = [items.index(char) for char in itemstr]
+def max_diff_min(indexes):
+    "Sort key of a combination given by its item positions: (min gap, gaps)"
     if len(indexes) > 1:
-        gap_counts = np.ediff1d(indexes).tolist()
-        mdm = min(gap_counts), tuple(gap_counts)
+        gap_counts = tuple(b - a for a, b in zip(indexes, indexes[1:]))
+        mdm = min(gap_counts), gap_counts
     else:
         mdm = 0, tuple()
     return mdm
 
-def ordered_combinations(items, r):
-    combs = combinations(items, r)
-    oc = sorted(combs, key=max_diff_min)
-    return oc
-
-for i in range(1, len(items)+1):
-    comb_dict = {i-1: []}
-    for r in range(1,i):
-        for c in ordered_combinations(items, r):
-            comb_str = "".join(c)
-            comb_dict[i-1].append(comb_str)
-    c_dict.update(comb_dict)
+def iter_ordered_combinations(items, r):
+    """
+    Generate the `r`-combinations of `items` in `max_diff_min` order, without
+    sorting or looking up item positions (combinations of fewer than 2 items are
+    in the order of `itertools.combinations`).
+    """
+    items = list(items)
+    n = len(items)
+    if r < 2:
+        yield from combinations(items, r)
+        return
+    for m in range(1, (n - 1) // (r - 1) + 1):
+        for gaps in iter_gap_sequences(n, r, minimum=m):
+            if m not in gaps:
+                continue
+            indices = (0, *accumulate(gaps))
+            for offset in range(n - indices[-1]):
+                yield tuple(items[offset + i] for i in indices)
 
-for i in range(1, len(items)+1):
-    u_comb_dict = {i-1: []}
-    for r in range(1,i):
-        for c in combinations(items, r):
-            comb_str = "".join(c)
-            u_comb_dict[i-1].append(comb_str)
-    uc_dict.update(u_comb_dict)
+def ordered_combinations(items, r):
+    "Return the `r`-combinations of `items` in `max_diff_min` order as a list"
+    return list(iter_ordered_combinations(items, r))
 
 def print_num_tuple_list(num_tuple_list):
     tup_repr = "  ".join(repr([repr(pos).replace(" ","") for pos in
@@ -46,26 +50,48 @@ def print_pos_diffs(pos_diffs):
         "").split(")("))[1:-1]).replace("(", " ").replace(")"," "))
     return
 
-def vals_to_pos_tup_list(vals_str_list):
-    pos_tup_list = [tuple([items.index(x) for x in v]) for v in vals_str_list]
+def vals_to_pos_tup_list(vals_str_list, items):
+    positions = {x: i for i, x in enumerate(items)}
+    pos_tup_list = [tuple([positions[x] for x in v]) for v in vals_str_list]
     return pos_tup_list
 
 def pos_list_to_diffs(pos_list):
-    diffs = [tuple(np.ediff1d(x)) for x in pos_list]
+    diffs = [tuple(b - a for a, b in zip(x, x[1:])) for x in pos_list]
     return diffs
 
-four_vals = [x for x in c_dict[4] if len(x) > 3]
-fv_pos = vals_to_pos_tup_list(four_vals)
-fv_diffs = pos_list_to_diffs(fv_pos)
+if __name__ == "__main__":
+    items = list("abcdef")
+    c_dict = dict()
+    uc_dict = dict()
+
+    for i in range(1, len(items)+1):
+        comb_dict = {i-1: []}
+        for r in range(1,i):
+            for c in iter_ordered_combinations(items, r):
+                comb_str = "".join(c)
+                comb_dict[i-1].append(comb_str)
+        c_dict.update(comb_dict)
+
+    for i in range(1, len(items)+1):
+        u_comb_dict = {i-1: []}
+        for r in range(1,i):
+            for c in combinations(items, r):
+                comb_str = "".join(c)
+                u_comb_dict[i-1].append(comb_str)
+        uc_dict.update(u_comb_dict)
+
+    four_vals = [x for x in c_dict[4] if len(x) > 3]
+    fv_pos = vals_to_pos_tup_list(four_vals, items)
+    fv_diffs = pos_list_to_diffs(fv_pos)
 
-u_four_vals = [x for x in uc_dict[4] if len(x) > 3]
-ufv_pos = vals_to_pos_tup_list(u_four_vals)
-ufv_diffs = pos_list_to_diffs(ufv_pos)
+    u_four_vals = [x for x in uc_dict[4] if len(x) > 3]
+    ufv_pos = vals_to_pos_tup_list(u_four_vals, items)
+    ufv_diffs = pos_list_to_diffs(ufv_pos)
 
-print(four_vals)
-print_num_tuple_list(fv_pos)
-print_pos_diffs(fv_diffs)
-print()
-print(u_four_vals)
-print_num_tuple_list(ufv_pos)
-print_pos_diffs(ufv_diffs)
+    print(four_vals)
+    print_num_tuple_list(fv_pos)
+    print_pos_diffs(fv_diffs)
+    print()
+    print(u_four_vals)
+    print_num_tuple_list(ufv_pos)
+    print_pos_diffs(ufv_diffs)
@@ -0,0 +1,69 @@
+from itertools import accumulate
+
+# The order of `more_itertools_ps_sort.py`, i.e. `more_itertools.powerset` sorted by
+# `ps_sorter` (subset length, then the list of gaps between successive elements),
+# generated directly: for each length, the gap sequences are enumerated in
+# lexicographic order (subject to fitting in the `n` items), and each is swept over
+# its offsets (the sort being stable, equal gaps keep the powerset's offset order).
+
+def _next_gaps(gaps, max_distance, minimum=1):
+    """
+    Step the list of `gaps` (each at least `minimum`) in place to the
+    lexicographically next gap sequence of the same length whose sum is at most
+    `max_distance`, returning False if there is none.
+    """
+    k = len(gaps)
+    prefix = sum(gaps)
+    for i in range(k - 1, -1, -1):
+        prefix -= gaps[i]
+        # increment gaps[i] and reset all of the gaps after it to the minimum
+        if prefix + gaps[i] + 1 + (k - 1 - i) * minimum <= max_distance:
+            gaps[i] += 1
+            for j in range(i + 1, k):
+                gaps[j] = minimum
+            return True
+    return False
+
+def iter_gap_sequences(n, r, minimum=1):
+    """
+    Generate the gap sequences of the `r`-subsets of `n` items (with every gap at
+    least `minimum`) in lexicographic order
+    """
+    if r < 2 or (r - 1) * minimum > n - 1:
+        return
+    gaps = [minimum] * (r - 1)
+    while True:
+        yield tuple(gaps)
+        if not _next_gaps(gaps, n - 1, minimum):
+            return
+
+def iter_gap_ordered_powerset(items, subset_handler=tuple):
+    """
+    Generate the powerset of `items` in the order of `sorted(powerset(items),
+    key=ps_sorter)` (for evenly spaced items, e.g. `range(n)`, or by position
+    otherwise), without materialising or sorting it. The `subset_handler` is
+    called as in `generate_powerset`.
+    """
+    n = len(items)
+    yield subset_handler()
+    for offset in range(n):
+        yield subset_handler([items[offset]])
+    for r in range(2, n + 1):
+        for gaps in iter_gap_sequences(n, r):
+            indices = (0, *accumulate(gaps))
+            for offset in range(n - indices[-1]):
+                yield subset_handler([items[offset + i] for i in indices])
+
+def lexsort_gap_order(block):
+    """
+    Return the rows of `block` (a `(count, r)` NumPy array of equal-length subsets
+    with ascending values) sorted as by `ps_sorter`, i.e. lexicographically by
+    their gaps, with all of the sort keys built in one vectorised pass
+    (`np.lexsort` is stable, so tied rows keep their order as `sorted` would).
+    """
+    import numpy as np
+    gaps = np.diff(block, axis=1)
+    if gaps.shape[1] == 0:
+        return block
+    # `np.lexsort` takes its primary key last
+    return block[np.lexsort(gaps.T[::-1])]
@@ -0,0 +1,84 @@
+from ord_pset.pset_partitions import iter_level_partitions
+from itertools import accumulate
+import numpy as np
+
+# Vectorised output of the ordered powerset as blocks of item indices. Every run of
+# subsets generated from a partition is the broadcast `base + offsets[:, None]` of
+# its cumulative indices `base` over the offsets `range(n - distance)`, so a whole
+# level is built with `np.repeat` of the bases and a flattened `arange` of offsets.
+
+def _partition_rows(partitions, n, dtype):
+    "Return the index matrix of all subsets generated from a list of `partitions`"
+    bases = np.array([(0, *accumulate(p)) for p in partitions], dtype=dtype)
+    runs = n - bases[:, -1]
+    run_starts = np.cumsum(runs) - runs
+    offsets = np.arange(runs.sum(), dtype=dtype) - np.repeat(run_starts, runs)
+    return np.repeat(bases, runs, axis=0) + offsets[:, None]
+
+def _to_membership(block, n):
+    "Convert an index matrix into a boolean (count, n) membership matrix"
+    membership = np.zeros((len(block), n), dtype=bool)
+    membership[np.arange(len(block))[:, None], block] = True
+    return membership
+
+def _level_blocks(n, p_len, block_size, dtype):
+    "Generate index matrices of at most `block_size` rows for a single level"
+    if p_len == 0:
+        rows = np.arange(n, dtype=dtype)[:, None]
+        for start in range(0, n, block_size or max(n, 1)):
+            yield rows[start:start + block_size] if block_size else rows
+        return
+    pending = np.empty((0, p_len + 1), dtype=dtype)
+    batch = []
+    batch_rows = 0
+    partitions = iter_level_partitions(n, p_len)
+    while True:
+        partition = next(partitions, None)
+        if partition is not None:
+            batch.append(partition)
+            batch_rows += n - sum(partition)
+            if block_size is None or batch_rows < block_size:
+                continue
+        if batch:
+            rows = _partition_rows(batch, n, dtype)
+            if len(pending):
+                rows = np.concatenate([pending, rows])
+            batch = []
+            batch_rows = 0
+            if block_size is None:
+                pending = rows
+            else:
+                full = len(rows) - len(rows) % block_size
+                for start in range(0, full, block_size):
+                    yield rows[start:start + block_size]
+                pending = rows[full:]
+        if partition is None:
+            break
+    if len(pending):
+        yield pending
+
+def iter_index_blocks(n, by="level", block_size=None, membership=False, dtype=np.intp):
+    """
+    Generate the ordered powerset of `n` items (excluding the empty set) as NumPy
+    blocks, yielding `(p_len, block)` pairs where `p_len` is the level (as in the
+    keys of `generate_powerset`) and `block` is a `(count, p_len + 1)` matrix of item
+    indices, or a `(count, n)` boolean membership matrix if `membership` is True.
+
+    Blocks are either one per level (`by="level"`), optionally split into blocks of
+    at most `block_size` rows, or one per permuted partition (`by="partition"`).
+    Concatenating the rows of the blocks gives the order of `iter_powerset`.
+    """
+    assert by in ("level", "partition"), ValueError("by must be 'level' or 'partition'")
+    assert block_size is None or block_size > 0, ValueError("block_size must be positive")
+    for p_len in range(n):
+        if by == "level":
+            blocks = _level_blocks(n, p_len, block_size, dtype)
+        elif p_len == 0:
+            blocks = [np.arange(n, dtype=dtype)[:, None]]
+        else:
+            blocks = (
+                _partition_rows([partition], n, dtype)
+                for partition in iter_level_partitions(n, p_len)
+            )
+        for block in blocks:
+            yield p_len, _to_membership(block, n) if membership else block
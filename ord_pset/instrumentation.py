@@ -0,0 +1,137 @@
+from ord_pset.partition_cache import cached_partitions_by_length
+from itertools import accumulate
+from time import perf_counter
+import tracemalloc
+
+# Instrumented counterpart of the `generate_powerset` loop, used only when a `stats`
+# object is passed (so the plain loop carries no instrumentation at all). Time is
+# split between the partitions (building or loading the partition table, and
+# turning each partition into its index template), the materialisation of each
+# subset's list of items, and the subset handler calls, and recorded per level and
+# per partition. The per-subset timings are summed locally and reported to the
+# `stats` object once per partition, so a subclass can forward them elsewhere (e.g.
+# to a metrics client) by overriding its `record_*` methods.
+
+def _new_level():
+    return {
+        "subsets": 0, "partitions": 0, "partition_seconds": 0.0,
+        "materialise_seconds": 0.0, "handler_seconds": 0.0, "peak_bytes": None,
+    }
+
+class PowersetStats:
+    """
+    Statistics of a `generate_powerset(..., stats=PowersetStats())` call: the subset
+    count and the time spent on partitions, materialisation and the handler per
+    level (in `.levels`), the subset count per partition (in `.partitions`, with the
+    empty set and singletons under the level 0 partition `()`), and if
+    `trace_allocations` the peak memory allocated (by `tracemalloc`) per level and
+    overall (which slows generation down considerably more than the timings).
+    """
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        self.levels = {}
+        self.partitions = {}
+        self.table_seconds = 0.0
+        self.total_seconds = None
+        self.peak_bytes = None
+        self._started_tracing = False
+
+    def start(self):
+        self._t0 = perf_counter()
+        if self.trace_allocations:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.peak_bytes = 0
+
+    def record_table(self, seconds):
+        "Record the time taken to get the partition table"
+        self.table_seconds += seconds
+
+    def start_level(self, p_len):
+        self.levels.setdefault(p_len, _new_level())
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            self._level_base = tracemalloc.get_traced_memory()[0]
+
+    def record_partition(self, p_len, partition, subsets, partition_seconds,
+        materialise_seconds, handler_seconds):
+        "Record the subsets made from one partition and the time taken on each step"
+        level = self.levels[p_len]
+        level["subsets"] += subsets
+        level["partitions"] += 1
+        level["partition_seconds"] += partition_seconds
+        level["materialise_seconds"] += materialise_seconds
+        level["handler_seconds"] += handler_seconds
+        self.partitions[partition] = self.partitions.get(partition, 0) + subsets
+
+    def end_level(self, p_len):
+        if self.trace_allocations:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.levels[p_len]["peak_bytes"] = peak - self._level_base
+            self.peak_bytes = max(self.peak_bytes, peak)
+
+    def stop(self):
+        self.total_seconds = perf_counter() - self._t0
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def summary(self):
+        "Return the totals over all levels (counts, seconds and the peak memory)"
+        totals = {k: sum(level[k] for level in self.levels.values()) for k in (
+            "subsets", "partitions", "partition_seconds", "materialise_seconds",
+            "handler_seconds",
+        )}
+        totals["partition_seconds"] += self.table_seconds
+        totals["total_seconds"] = self.total_seconds
+        totals["peak_bytes"] = self.peak_bytes
+        return totals
+
+def instrumented_powerset(items, subset_handler, stats, cache_dir=None):
+    "The `generate_powerset` loop, reporting to the `stats` object as it goes"
+    clock = perf_counter
+    n = len(items)
+    stats.start()
+    t = clock()
+    p_dict = cached_partitions_by_length(n-1, cache_dir=cache_dir)
+    stats.record_table(clock() - t)
+    ps = {}
+    for p_len, parts in p_dict.items():
+        stats.start_level(p_len)
+        level = ps.setdefault(p_len, [])
+        if p_len == 0:
+            # the empty set and singletons
+            t0 = clock()
+            level.append(subset_handler())
+            t1 = clock()
+            materialise_s, handler_s = 0.0, t1 - t0
+            for offset in range(n):
+                t0 = clock()
+                subset_items = [items[offset]]
+                t1 = clock()
+                level.append(subset_handler(subset_items))
+                t2 = clock()
+                materialise_s += t1 - t0
+                handler_s += t2 - t1
+            stats.record_partition(0, (), n + 1, 0.0, materialise_s, handler_s)
+        for partition in parts:
+            t0 = clock()
+            distance = sum(partition)
+            indices = list(accumulate(partition))
+            partition_s = clock() - t0
+            materialise_s = handler_s = 0.0
+            for offset in range(n - distance):
+                t0 = clock()
+                subset_items = [items[offset]] + [items[offset + i] for i in indices]
+                t1 = clock()
+                level.append(subset_handler(subset_items))
+                t2 = clock()
+                materialise_s += t1 - t0
+                handler_s += t2 - t1
+            stats.record_partition(p_len, partition, n - distance, partition_s,
+                materialise_s, handler_s)
+        stats.end_level(p_len)
+    stats.stop()
+    return ps
@@ -6,9 +6,12 @@ def ps_sorter(tup):
     d = ediff1d(tup).tolist()
     return l, d
 
-ps = powerset([1,2,3,4])
+# See `ord_pset.gap_order.iter_gap_ordered_powerset` to generate this order directly
 
-ps = sorted(ps, key=ps_sorter)
+if __name__ == "__main__":
+    ps = powerset([1,2,3,4])
 
-for x in ps:
-    print(x)
+    ps = sorted(ps, key=ps_sorter)
+
+    for x in ps:
+        print(x)
@@ -0,0 +1,172 @@
+from ord_pset.bit_strings import (
+    bitstr_len, bitstr_len_lencoded, iter_codewords, join_bit_pieces, pack_codewords,
+)
+from ord_pset.bitmasks import indices_to_bitmask
+from ord_pset.partition_counts import level_counts, partition_counts
+from ord_pset.pset_partitions import uniquely_permute
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from os import cpu_count
+
+# Sharded generation of the ordered powerset over a process pool. The work is cut
+# into contiguous shards of (level, ascending partition) runs (each of which is a
+# known number of subsets from `partition_counts`), balanced to roughly equal
+# subset counts, and the shard results are stitched back together in submission
+# order so the output is exactly the canonical (`iter_powerset`) order. Bitstream
+# encoding is split the same way, by level and then into chunks of values, with
+# the packed chunks joined back together at (non byte-aligned) bit boundaries.
+
+def plan_shards(n, n_shards):
+    """
+    Split the ordered powerset of `n` items (excluding the empty set) into at most
+    roughly `n_shards` contiguous shards of about equal subset counts, returning a
+    list of `(count, runs)` pairs where `runs` is a list of `(p_len, asc_partition)`
+    (the singletons at level 0 being the run `(0, None)`).
+    """
+    total = sum(level_counts(n)) - 1
+    target = max(1, -(-total // max(1, n_shards)))
+    shards = []
+    runs = []
+    count = 0
+    weighted_runs = [((0, None), n)] if n else []
+    for p_len in range(1, n):
+        weighted_runs.extend(((p_len, p), c) for p, c in partition_counts(n, p_len))
+    for run, run_count in weighted_runs:
+        runs.append(run)
+        count += run_count
+        if count >= target:
+            shards.append((count, runs))
+            runs = []
+            count = 0
+    if runs:
+        shards.append((count, runs))
+    return shards
+
+def _iter_shard_indices(n, runs):
+    "Generate the index tuples of the subsets of a shard's runs, in order"
+    for p_len, asc_partition in runs:
+        if asc_partition is None:
+            yield from ((offset,) for offset in range(n))
+            continue
+        distance = sum(asc_partition)
+        for partition in uniquely_permute(asc_partition):
+            indices = (0, *accumulate(partition))
+            for offset in range(n - distance):
+                yield tuple(offset + i for i in indices)
+
+def _shard_subsets(items, runs, subset_handler):
+    "Worker: return the handled subsets of one shard as a list"
+    return [
+        subset_handler([items[i] for i in indices])
+        for indices in _iter_shard_indices(len(items), runs)
+    ]
+
+def _shard_bitmasks(n, runs):
+    "Worker: return the packed `array('Q')` bitmasks of one shard as bytes"
+    packed = array("Q")
+    for p_len, asc_partition in runs:
+        if asc_partition is None:
+            packed.extend(1 << offset for offset in range(n))
+            continue
+        run = n - sum(asc_partition)
+        for partition in uniquely_permute(asc_partition):
+            mask = indices_to_bitmask(accumulate(partition, initial=0))
+            packed.extend(mask << offset for offset in range(run))
+    return packed.tobytes()
+
+def _ordered_results(fn, shard_args, max_workers, window):
+    """
+    Submit `fn(*args)` for each of `shard_args` to a process pool, with at most
+    `window` results outstanding (bounding memory), and yield results in order.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for args in shard_args:
+            pending.append(executor.submit(fn, *args))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def iter_powerset_parallel(items, subset_handler=tuple, max_workers=None, shards_per_worker=4):
+    """
+    Generate the powerset of `items` in the order of `iter_powerset`, with the
+    subsets produced in worker processes in shards balanced by their subset counts.
+    The `subset_handler` (and the items) must be picklable, e.g. a module-level
+    function such as `string_handler`.
+    """
+    items = list(items)
+    workers = max_workers or cpu_count() or 1
+    shards = plan_shards(len(items), workers * shards_per_worker)
+    yield subset_handler()
+    shard_args = ((items, runs, subset_handler) for count, runs in shards)
+    for subsets in _ordered_results(_shard_subsets, shard_args, workers, 2 * workers):
+        yield from subsets
+
+def write_bitmasks_parallel(n, sink, max_workers=None, shards_per_worker=4):
+    """
+    Write the ordered powerset of `n` items (`n <= 64`) to the file-like `sink` as
+    packed `array('Q')` bitmasks (as from `bitmasks.bitmask_array`), generated in
+    balanced shards across worker processes. Return the number of subsets written.
+    """
+    assert n <= 64, ValueError("Can't pack bitmasks of more than 64 items")
+    workers = max_workers or cpu_count() or 1
+    shards = plan_shards(n, workers * shards_per_worker)
+    sink.write(array("Q", [0]).tobytes()) # the empty set
+    written = 1
+    shard_args = ((n, runs) for count, runs in shards)
+    for packed in _ordered_results(_shard_bitmasks, shard_args, workers, 2 * workers):
+        sink.write(packed)
+        written += len(packed) // 8
+    return written
+
+def _encode_chunk(values, max_l, lencode):
+    "Worker: return the packed `(bytes, bit length)` `bitstream_ins` codewords of `values`"
+    packed, nbits = pack_codewords(iter_codewords(values, max_l, lencode))
+    return bytes(packed), nbits
+
+def bitstream_ins_parallel(levels, bstream=None, fixed_length=False, lencode=False,
+    raw=False, max_workers=None, chunk_size=2**16):
+    """
+    Encode each of `levels` (iterables of integers, e.g. the levels of the ordered
+    powerset) as `bitstream_ins` would, in chunks of `chunk_size` values across
+    worker processes, and join the packed chunks at their bit boundaries. The result
+    is bit-identical to calling `bitstream_ins(level, bstream=bs, ...)` on each level
+    in turn (so a `fixed_length` codeword length is set per level, by its maximum),
+    and is inserted into `bstream` (a new BitStream if None), or returned as the raw
+    `(bytearray, bit length)` if `raw`.
+
+    Chunks are independent because each codeword depends only on its own value (and
+    for `fixed_length`, its level's maximum, found before splitting); a `lencode`
+    level must be ascending, as for `bitstream_ins`, but an out of order value is
+    only detected within its chunk. Ranges and lists are sliced into chunks as is
+    (a `range` pickles to a few bytes), other iterables (including NumPy arrays)
+    are first made into lists of Python ints.
+    """
+    assert not (lencode and fixed_length), ValueError("Can't lencode fixed length")
+    workers = max_workers or cpu_count() or 1
+    lenfunc = bitstr_len_lencoded if lencode else bitstr_len
+
+    def chunk_args():
+        for level in levels:
+            if hasattr(level, "dtype"):
+                level = level.tolist() # NumPy integers have no `bit_length`
+            elif not isinstance(level, (list, tuple, range)):
+                level = list(level)
+            if not level:
+                continue
+            max_l = lenfunc(int(max(level))) if fixed_length else None
+            for start in range(0, len(level), chunk_size):
+                yield level[start:start + chunk_size], max_l, lencode
+
+    pieces = _ordered_results(_encode_chunk, chunk_args(), workers, 2 * workers)
+    packed, nbits = join_bit_pieces(pieces)
+    if raw:
+        return packed, nbits
+    from bitstring import Bits, BitStream
+    if bstream is None:
+        bstream = BitStream()
+    bstream.insert(Bits(bytes=bytes(packed), length=nbits))
+    return bstream
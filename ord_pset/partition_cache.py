@@ -0,0 +1,184 @@
+from ord_pset.pset_partitions import iter_level_partitions, partitions_by_length
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from math import comb
+from pathlib import Path
+from sys import getsizeof
+from threading import Lock
+import mmap
+import os
+import struct
+import tempfile
+
+# The `partitions_by_length(n-1, sorting=True, permuting=True)` table depends only
+# on `n`, so it is cached: in process, in a least-recently-used cache bounded by an
+# estimate of its memory use, and optionally on disk in a compact binary file which
+# is memory-mapped (so the pages are shared between all processes reading it).
+#
+# File layout (little-endian):
+#   - header: magic `b"OPPT"`, format version (B), max_n (I)
+#   - counts: the number of partitions in each level `0..max_n` (max_n + 1 × Q)
+#   - body: for each level `k`, its partitions as consecutive rows of `k` bytes
+
+MAGIC = b"OPPT"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")
+
+def _table_nbytes(table):
+    "Estimate the memory used by a partition table (the tuples and level containers)"
+    nbytes = getsizeof(table)
+    for parts in table.values():
+        nbytes += getsizeof(parts)
+        if parts:
+            # all partitions in a level have the same length
+            nbytes += len(parts) * getsizeof(parts[0])
+    return nbytes
+
+class PartitionTableCache:
+    """
+    Least-recently-used cache of partition tables, evicting the oldest tables once
+    the estimated total size exceeds `max_nbytes` (a table bigger than that on its
+    own is returned without being cached). Cached tables are shared between callers
+    so their levels are tuples rather than lists, and must not be modified.
+    """
+    def __init__(self, max_nbytes=256 * 2**20):
+        self.max_nbytes = max_nbytes
+        self.nbytes = 0
+        self._tables = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, max_n, sorting=True, permuting=True, cache_dir=None):
+        "Return the (cached) `partitions_by_length(max_n, sorting, permuting)` table"
+        key = (max_n, sorting, permuting, cache_dir)
+        with self._lock:
+            if key in self._tables:
+                self._tables.move_to_end(key)
+                return self._tables[key][0]
+        if cache_dir is not None and sorting and permuting and max_n > 0:
+            table = load_partition_table(max_n, cache_dir)
+            nbytes = getsizeof(table)
+        else:
+            table = partitions_by_length(max_n, sorting=sorting, permuting=permuting)
+            table = {k: tuple(parts) for k, parts in table.items()}
+            nbytes = _table_nbytes(table)
+        if nbytes <= self.max_nbytes:
+            with self._lock:
+                if key not in self._tables:
+                    self._tables[key] = (table, nbytes)
+                    self.nbytes += nbytes
+                while self.nbytes > self.max_nbytes:
+                    evicted_table, evicted_nbytes = self._tables.popitem(last=False)[1]
+                    self.nbytes -= evicted_nbytes
+        return table
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self.nbytes = 0
+
+default_cache = PartitionTableCache()
+
+def cached_partitions_by_length(max_n, sorting=True, permuting=True, cache_dir=None):
+    """
+    Return `partitions_by_length(max_n, sorting, permuting)` from the process-wide
+    `default_cache` (with tuples in place of lists). If `cache_dir` is given, the
+    sorted and permuted table is memory-mapped from a file there, which is built
+    once (by whichever process first needs it) and reused by all others.
+    """
+    return default_cache.get(max_n, sorting, permuting, cache_dir)
+
+def partition_table_path(max_n, cache_dir):
+    "Path of the on-disk partition table for `max_n` in `cache_dir`"
+    return Path(cache_dir) / f"partitions_{max_n}.bin"
+
+def write_partition_table(max_n, path):
+    """
+    Write the sorted and permuted `partitions_by_length(max_n)` table to `path`,
+    streaming the partitions one level at a time. The file is written under a
+    temporary name and then renamed, so readers never see a partial file.
+    """
+    assert 0 < max_n < 256, ValueError("Partition parts must fit in a byte")
+    path = Path(path)
+    counts = [0] + [comb(max_n, k) for k in range(1, max_n + 1)]
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, max_n))
+            f.write(struct.pack(f"<{max_n + 1}Q", *counts))
+            for k in range(1, max_n + 1):
+                buf = bytearray()
+                for partition in iter_level_partitions(max_n + 1, k):
+                    buf.extend(partition)
+                    if len(buf) >= 2**20:
+                        f.write(buf)
+                        buf.clear()
+                f.write(buf)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+def load_partition_table(max_n, cache_dir):
+    "Return the memory-mapped partition table for `max_n`, writing it if not yet cached"
+    path = partition_table_path(max_n, cache_dir)
+    if not path.exists():
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        write_partition_table(max_n, path)
+    return MappedPartitionTable(path)
+
+class _MappedLevel(Sequence):
+    "The partitions of one level of a `MappedPartitionTable`, decoded on access"
+    def __init__(self, buf, length, count):
+        self._buf = buf
+        self._length = length
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("partition index out of range")
+        start = i * self._length
+        return tuple(self._buf[start:start + self._length])
+
+    def __iter__(self):
+        k = self._length
+        buf = self._buf
+        for start in range(0, self._count * k, k):
+            yield tuple(buf[start:start + k])
+
+class MappedPartitionTable(Mapping):
+    """
+    Read-only `{level: partitions}` mapping over a memory-mapped partition table
+    file (as written by `write_partition_table`), usable in place of the dict from
+    `partitions_by_length`.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_n = HEADER.unpack_from(self._mmap)
+        assert magic == MAGIC and version == VERSION, ValueError(f"Not a partition table: {path}")
+        self.max_n = max_n
+        counts = struct.unpack_from(f"<{max_n + 1}Q", self._mmap, HEADER.size)
+        body = memoryview(self._mmap)[HEADER.size + 8 * (max_n + 1):]
+        self._levels = {0: ()}
+        start = 0
+        for k in range(1, max_n + 1):
+            end = start + counts[k] * k
+            self._levels[k] = _MappedLevel(body[start:end], k, counts[k])
+            start = end
+
+    def __getitem__(self, k):
+        return self._levels[k]
+
+    def __iter__(self):
+        return iter(self._levels)
+
+    def __len__(self):
+        return len(self._levels)
@@ -0,0 +1,141 @@
+from ord_pset.pset_partitions import asc_partitions_of_length
+from functools import lru_cache
+from math import comb, factorial
+from sys import getsizeof
+
+# Pure Python (Sage-free) counterparts of `sagefuncs/partition_counts.py`, which
+# count rather than enumerate wherever a closed form exists (binomials for levels
+# and distances, multinomials for the permutations of a partition). Partitions
+# are only enumerated for per-partition counts, and then only those of one level.
+
+def multinomial(counts):
+    "Number of unique permutations of a multiset with the given element `counts`"
+    m = factorial(sum(counts))
+    for c in counts:
+        m //= factorial(c)
+    return m
+
+def composition_count(distance, p_len, minimum=1):
+    """
+    Count the compositions of `distance` into `p_len` parts, each of which is at
+    least `minimum` (i.e. the permuted partitions whose smallest part is at least
+    `minimum`).
+    """
+    if p_len == 0:
+        return int(distance == 0)
+    free = distance - p_len * (minimum - 1)
+    if free < p_len:
+        return 0
+    return comb(free - 1, p_len - 1)
+
+@lru_cache(maxsize=None)
+def level_counts(n):
+    """
+    Return the number of subsets at each level of `generate_powerset` for `n` items,
+    i.e. `[len(ps[p_len]) for p_len in ps]` (level 0 holds the empty set and the
+    singletons, level `p_len` otherwise holds the subsets of size `p_len + 1`).
+    """
+    counts = [comb(n, p_len + 1) for p_len in range(max(n, 1))]
+    counts[0] += 1
+    return tuple(counts)
+
+@lru_cache(maxsize=None)
+def distance_counts(n, p_len):
+    """
+    Return `(distance, count)` pairs for the subsets at level `p_len` of the powerset
+    of `n` items, where the distance is the partition sum (last minus first index).
+    Each distance contributes `n - distance` offsets of each of its compositions.
+    """
+    assert p_len > 0, ValueError("Level 0 subsets have no partition distance")
+    return tuple(
+        (distance, (n - distance) * comb(distance - 1, p_len - 1))
+        for distance in range(p_len, n)
+    )
+
+@lru_cache(maxsize=None)
+def partition_counts(n, p_len, multiplied=True):
+    """
+    Return `(partition, count)` pairs for the ascending partitions at level `p_len`
+    of the powerset of `n` items, in the order they are generated. The count is the
+    number of subsets generated from the partition, `(n - sum(p)) * multinomial`,
+    or the pair of those two factors if `multiplied` is False.
+    """
+    assert p_len > 0, ValueError("Level 0 subsets have no partitions")
+    counts = []
+    for distance in range(p_len, n):
+        for p in asc_partitions_of_length(distance, p_len):
+            m = multinomial([p.count(x) for x in set(p)])
+            counts.append((p, (n - distance) * m if multiplied else (n - distance, m)))
+    return tuple(counts)
+
+def comb_partitions(n):
+    """
+    Sage-free `sagefuncs.comb_partitions`: return a list (indexed by level) of the
+    partitions of each `r` in `range(n)` into that many parts, as lists in Sage's
+    (reverse lexicographic, descending) order.
+    """
+    r_partitions = {}
+    for r in range(n):
+        for l in range(r + 1):
+            l_partitions = [p[::-1] for p in asc_partitions_of_length(r, l)]
+            if l == 0 and r == 0:
+                l_partitions = [()]
+            l_partitions.sort(reverse=True)
+            r_partitions.setdefault(l, []).extend(list(p) for p in l_partitions)
+    return list(r_partitions.values())
+
+def comb_partition_multinom_coeffs(n):
+    "Sage-free `sagefuncs.comb_partition_multinom_coeffs` (without printing)"
+    coeffs = [[multinomial([p.count(x) for x in set(p)]) for p in p_list]
+        for p_list in comb_partitions(n)]
+    coeffs[:1] = [[]]
+    return coeffs
+
+def comb_partition_counts(n, multiplied=False):
+    "Sage-free `sagefuncs.comb_partition_counts` (without printing)"
+    counts = []
+    for p_list in comb_partitions(n):
+        multinoms = [multinomial([p.count(x) for x in set(p)]) for p in p_list]
+        if multiplied:
+            counts.append([(n - sum(p)) * m for p, m in zip(p_list, multinoms)])
+        else:
+            counts.append([(n - sum(p), m) for p, m in zip(p_list, multinoms)])
+    counts[:1] = [[]]
+    return counts
+
+# Bytes per subset of `size` items (out of `n`) for each subset handler/encoding:
+#   - "tuple": the tuple object (not counting the items, which are shared)
+#   - "str": `string_handler` output when every item is a 1-character ASCII string
+#   - "index": a row of a (count, size) int64 index matrix
+#   - "bitmask": a uint64 word for `n <= 64`, otherwise a Python int
+# and bits per subset for encodings which are packed into a single stream:
+#   - "toggle": the `n`-bit characteristic (membership) vector
+SUBSET_NBYTES = {
+    "tuple": lambda n, size: getsizeof(tuple(range(size))),
+    "str": lambda n, size: getsizeof("a" * size),
+    "index": lambda n, size: 8 * size,
+    "bitmask": lambda n, size: 8 if n <= 64 else getsizeof(1 << (n - 1)),
+}
+SUBSET_NBITS = {
+    "toggle": lambda n, size: n,
+}
+
+def predicted_nbytes(n, encoding="tuple", p_len=None):
+    """
+    Predict the number of bytes taken up by the powerset of `n` items (or just its
+    level `p_len`) when every subset is output with the given `encoding` (one of
+    the keys of `SUBSET_NBYTES` or `SUBSET_NBITS`), computed from the level counts
+    without generating any subsets.
+    """
+    levels = range(len(level_counts(n))) if p_len is None else [p_len]
+    sized_counts = []
+    for l in levels:
+        count = comb(n, l + 1)
+        sized_counts.append((l + 1, count))
+        if l == 0:
+            sized_counts.append((0, 1)) # the empty set
+    if encoding in SUBSET_NBITS:
+        nbits = sum(count * SUBSET_NBITS[encoding](n, size) for size, count in sized_counts)
+        return (nbits + 7) // 8
+    assert encoding in SUBSET_NBYTES, ValueError(f"Unknown encoding {encoding!r}")
+    return sum(count * SUBSET_NBYTES[encoding](n, size) for size, count in sized_counts)
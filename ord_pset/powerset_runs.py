@@ -0,0 +1,98 @@
+from ord_pset.partition_counts import partition_counts
+from ord_pset.pset_partitions import next_permutation
+from ord_pset.ranking import part_counts, unrank_permutation
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+
+# Every subset of the ordered powerset is a partition (as a cumulative index
+# template) plus an offset in `range(n - distance)`, and the unique permutations of
+# an ascending partition are contiguous, so the whole powerset is described by one
+# `(start, p_len, asc_partition)` run per ascending partition: its subsets are the
+# permutations of `asc_partition` (in lexicographic order), each swept over its
+# offsets. The number of runs grows with the number of integer partitions of the
+# distances (about 23,000 at `n = 30`) rather than with the `2**n` subsets, which are
+# only materialised on access, a permutation being found from its rank by counting.
+# The singletons are the run of the empty partition at level 0.
+
+class PowersetRuns(Sequence):
+    """
+    Sequence of the powerset of `items` (in the order of `iter_powerset`) stored as
+    its partition runs (`.runs`), with each subset materialised when accessed by
+    index, slice or iteration. The `subset_handler` is called as in `iter_powerset`.
+    """
+    def __init__(self, items, subset_handler=tuple):
+        self.items = items
+        self.subset_handler = subset_handler
+        n = len(items)
+        self.n = n
+        self.runs = [(1, 0, ())] if n else []
+        start = 1 + n
+        for p_len in range(1, n):
+            for asc_partition, count in partition_counts(n, p_len):
+                self.runs.append((start, p_len, asc_partition))
+                start += count
+        self._starts = [start for start, _, _ in self.runs]
+        self._len = start if n else 1
+
+    def __len__(self):
+        return self._len
+
+    def __reduce__(self):
+        # the runs are rebuilt from the items rather than sent
+        return type(self), (self.items, self.subset_handler)
+
+    def _subset(self, indices, offset):
+        return self.subset_handler([self.items[offset + i] for i in indices])
+
+    def _locate(self, i):
+        "Return the run number, the permutation of its partition and offset of subset `i`"
+        r = bisect_right(self._starts, i) - 1
+        start, p_len, asc_partition = self.runs[r]
+        p_rank, offset = divmod(i - start, self.n - sum(asc_partition))
+        values, counts = part_counts(asc_partition)
+        return r, unrank_permutation(values, counts, p_rank), offset
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._len)
+            if step == 1:
+                return list(self._iter_from(start, stop))
+            return [self[j] for j in range(start, stop, step)]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("powerset index out of range")
+        if i == 0:
+            return self.subset_handler()
+        r, partition, offset = self._locate(i)
+        return self._subset((0, *accumulate(partition)), offset)
+
+    def __iter__(self):
+        return self._iter_from(0, self._len)
+
+    def _iter_from(self, i, stop):
+        "Generate the subsets `i:stop` (in range), stepping through the runs from `i`"
+        if i >= stop:
+            return
+        if i == 0:
+            yield self.subset_handler()
+            i = 1
+        if i >= stop:
+            return
+        r, partition, offset = self._locate(i)
+        a = list(partition)
+        while i < stop:
+            _, _, asc_partition = self.runs[r]
+            run = self.n - sum(asc_partition)
+            while i < stop:
+                indices = (0, *accumulate(a))
+                for o in range(offset, min(run, offset + stop - i)):
+                    yield self._subset(indices, o)
+                i += run - offset
+                offset = 0
+                if not next_permutation(a):
+                    break
+            r += 1
+            if r < len(self.runs):
+                a = list(self.runs[r][2])
@@ -0,0 +1,171 @@
+from ord_pset.bitmasks import iter_level_bitmasks
+from ord_pset.partition_counts import level_counts, partition_counts
+from array import array
+from itertools import chain, islice
+import mmap
+import struct
+import sys
+
+# On-disk format for a precomputed ordered powerset, read back by memory-mapping
+# it so that any level, partition run or range of subsets is a zero-copy slice.
+#
+# File layout (little-endian), with every section starting 8-byte aligned:
+#   - header: magic `b"OPSF"`, version (B), encoding (B), order (B), word size in
+#     bytes (B), n (I), number of partition records (Q)
+#   - level index: the subset index at which each level `0..n-1` starts, and the
+#     total number of subsets ((n + 1) × Q, or 2 × Q when `n` is 0)
+#   - partition index: a `(start, p_len, parts offset)` record (3 × Q) for each
+#     ascending partition, whose unique permutations (and their offsets) are the
+#     contiguous subsets from `start` (to the next record's `start`)
+#   - parts: the parts of each ascending partition, one byte each
+#   - body: one fixed-size word per subset (the subset's bitmask, as from
+#     `ord_pset.bitmasks`, in the smallest of 1, 2, 4 or 8 bytes that fits `n` bits)
+# Levels are as in the keys of `generate_powerset` (level 0 being the empty set and
+# the singletons, level `p_len` otherwise being the subsets of size `p_len + 1`).
+
+MAGIC = b"OPSF"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBIQ")
+RECORD = struct.Struct("<QQQ")
+ENCODINGS = {"bitmask": 0}
+ORDERS = {"minimal-distance": 0} # the order of `generate_powerset`
+WORD_TYPECODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+def _aligned(offset):
+    return offset + (-offset % 8)
+
+def _word_size(n):
+    "Smallest word size (in bytes) which holds an `n`-bit mask"
+    for size in WORD_TYPECODES:
+        if n <= 8 * size:
+            return size
+    raise ValueError("Can't pack bitmasks of more than 64 items")
+
+def _level_starts(n):
+    "The subset index at which each level starts, followed by the total"
+    starts = [0]
+    for count in level_counts(n):
+        starts.append(starts[-1] + count)
+    return starts
+
+def write_pset_file(path, n, write_size=2**16):
+    """
+    Write the ordered powerset of `n` items (`n <= 64`) to `path` as bitmasks,
+    with the level and partition indexes computed up front from the subset counts
+    so that the body is streamed straight from the generator, `write_size` subsets
+    at a time. Return the number of subsets written.
+    """
+    word_size = _word_size(n)
+    typecode = WORD_TYPECODES[word_size]
+    records = []
+    parts = bytearray()
+    start = 1 + n # after the empty set and singletons
+    for p_len in range(1, n):
+        for p, count in partition_counts(n, p_len):
+            records.append((start, p_len, len(parts)))
+            parts.extend(p)
+            start += count
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, ENCODINGS["bitmask"], ORDERS["minimal-distance"],
+            word_size, n, len(records),
+        ))
+        f.write(struct.pack(f"<{len(_level_starts(n))}Q", *_level_starts(n)))
+        for record in records:
+            f.write(RECORD.pack(*record))
+        f.write(parts)
+        f.write(bytes(-f.tell() % 8))
+        written = 0
+        for p_len in range(max(n, 1)):
+            masks = iter_level_bitmasks(n, p_len)
+            if p_len == 0:
+                masks = chain([0], masks) # the empty set
+            while True:
+                words = array(typecode, islice(masks, write_size))
+                if not words:
+                    break
+                if sys.byteorder != "little":
+                    words.byteswap()
+                f.write(words)
+                written += len(words)
+    return written
+
+class PowersetFile:
+    """
+    Read-only view of a powerset file (from `write_pset_file`), memory-mapped so
+    that levels and ranges of subsets are returned as zero-copy `memoryview`s of
+    the bitmask words (which `numpy.frombuffer` can also wrap without copying).
+    Close it (or use it as a context manager) to release the mapping, after
+    releasing any views taken from it (which would otherwise keep it open).
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self._mmap)
+        magic, version, encoding, order, word_size, n, n_records = header
+        assert magic == MAGIC and version == VERSION, ValueError(f"Not a powerset file: {path}")
+        self.n = n
+        self.encoding = {v: k for k, v in ENCODINGS.items()}[encoding]
+        self.order = {v: k for k, v in ORDERS.items()}[order]
+        self.word_size = word_size
+        offset = HEADER.size
+        n_starts = max(n, 1) + 1
+        self.level_starts = struct.unpack_from(f"<{n_starts}Q", self._mmap, offset)
+        offset += 8 * n_starts
+        self._records = [RECORD.unpack_from(self._mmap, offset + i * RECORD.size)
+            for i in range(n_records)]
+        offset += RECORD.size * n_records
+        self._parts_offset = offset
+        body_offset = _aligned(offset + sum(p_len for _, p_len, _ in self._records))
+        self._body = memoryview(self._mmap)[body_offset:]
+        if sys.byteorder == "little":
+            self.words = self._body.cast(WORD_TYPECODES[word_size])
+        else:
+            swapped = array(WORD_TYPECODES[word_size], self._body)
+            swapped.byteswap()
+            self.words = memoryview(swapped)
+
+    def __len__(self):
+        return self.level_starts[-1]
+
+    def __getitem__(self, i):
+        "The bitmask of the `i`-th subset, or a zero-copy view of a slice of them"
+        return self.words[i]
+
+    def level(self, p_len, start=0, stop=None):
+        "Zero-copy view of the bitmasks of level `p_len` (or its subsets `start:stop`)"
+        level_start, level_stop = self.level_starts[p_len], self.level_starts[p_len + 1]
+        stop = level_stop - level_start if stop is None else stop
+        assert 0 <= start <= stop <= level_stop - level_start, IndexError(
+            f"Subsets {start}:{stop} out of range for level {p_len}"
+        )
+        return self.words[level_start + start:level_start + stop]
+
+    def partitions(self, p_len=None):
+        """
+        Return `(asc_partition, start, stop)` for each ascending partition (at level
+        `p_len` if given), where `start:stop` are the indexes of its subsets.
+        """
+        runs = []
+        for i, (start, r_len, parts_offset) in enumerate(self._records):
+            if p_len is not None and r_len != p_len:
+                continue
+            at = self._parts_offset + parts_offset
+            asc_partition = tuple(self._mmap[at:at + r_len])
+            stop = self._records[i + 1][0] if i + 1 < len(self._records) else len(self)
+            runs.append((asc_partition, start, stop))
+        return runs
+
+    def close(self):
+        "Release the word views and close the memory map (raises if views remain)"
+        if self._mmap.closed:
+            return
+        self.words.release()
+        self._body.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
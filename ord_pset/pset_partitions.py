@@ -1,6 +1,7 @@
-from pprinting import pprint_tuple
-from itertools import permutations as permute
-from numpy import cumsum
+from ord_pset.bitmasks import indices_to_bitmask
+from ord_pset.pprinting import pprint_tuple
+from itertools import accumulate, islice, permutations as permute
+from math import comb
 
 # http://jeromekelleher.net/generating-integer-partitions.html
 # via
@@ -28,17 +29,142 @@ def asc_int_partitions(n):
         y = x + y - 1
         yield tuple(a[:k + 1])
 
+def asc_partitions_of_length(n, length, minimum=1):
+    """
+    Generate the partitions of `n` into exactly `length` parts (each part being at
+    least `minimum`) as ascending tuples, in the same (lexicographic) order that
+    `asc_int_partitions(n)` would produce them in, without visiting partitions of
+    any other length.
+    """
+    if length < 1 or n < length * minimum:
+        return
+    a = [minimum] * length
+    a[-1] = n - minimum * (length - 1)
+    while True:
+        yield tuple(a)
+        if not _next_asc_partition(a):
+            return
+
+def _next_asc_partition(a):
+    """
+    Step the ascending partition in the list `a` to the next one (in lexicographic
+    order) with the same sum and length in place, returning False if it was the last.
+    """
+    # Find the rightmost part (other than the last) which can be incremented,
+    # setting it and all parts after it to the new value, the last part taking
+    # whatever remains of the tail sum (which must still be at least as large)
+    length = len(a)
+    tail = a[-1]
+    i = length - 2
+    while i >= 0:
+        tail += a[i]
+        x = a[i] + 1
+        if tail >= x * (length - i):
+            for j in range(i, length - 1):
+                a[j] = x
+            a[-1] = tail - x * (length - i - 1)
+            return True
+        i -= 1
+    return False
+
 # Modified
 def asc_int_partitions_by_length(n):
     r_partitions = {}
     for p in asc_int_partitions(n):
         l = len(p)
 
+def multiset_permutations(iterable):
+    """
+    Generate the unique permutations of `iterable` in lexicographic order, starting
+    from its given arrangement (so all of them if it is sorted), by repeatedly
+    stepping to the next permutation in place (Narayana Pandita's algorithm).
+    """
+    a = list(iterable)
+    while True:
+        yield tuple(a)
+        if not next_permutation(a):
+            return
+
+def next_permutation(a):
+    """
+    Step the list `a` to its next unique permutation (in lexicographic order) in
+    place, returning False if it was already the last (i.e. non-increasing).
+    """
+    # the longest non-increasing suffix is the last in its lexicographic order
+    i = len(a) - 2
+    while i >= 0 and a[i] >= a[i + 1]:
+        i -= 1
+    if i < 0:
+        return False
+    # swap in the smallest larger value from the suffix, then make it ascending
+    j = len(a) - 1
+    while a[j] <= a[i]:
+        j -= 1
+    a[i], a[j] = a[j], a[i]
+    a[i + 1:] = a[:i:-1]
+    return True
+
+def _multiset_r_permutations(values, counts, r):
+    "Generate the unique `r`-length arrangements of a multiset in lexicographic order"
+    if r == 0:
+        yield ()
+        return
+    for i, v in enumerate(values):
+        if counts[i]:
+            counts[i] -= 1
+            for rest in _multiset_r_permutations(values, counts, r - 1):
+                yield (v, *rest)
+            counts[i] += 1
+
+def count_unique_permutations(iterable, r=None):
+    """
+    Count the unique (`r`-length, if given) permutations of the multiset `iterable`
+    without generating them, i.e. the multinomial coefficient of its element counts
+    if `r` is None (`len(list(uniquely_permute(sorted(iterable), r=r)))`, except
+    that the empty arrangement is counted once here but not yielded there).
+    """
+    items = sorted(iterable)
+    if r is None:
+        r = len(items)
+    if r > len(items):
+        return 0
+    # arrangements[j] is the number of j-length arrangements of the values so far
+    arrangements = [1]
+    for v in set(items):
+        c = items.count(v)
+        extended = [0] * min(len(arrangements) + c, r + 1)
+        for j, a in enumerate(arrangements):
+            for k in range(min(c, r - j) + 1):
+                extended[j + k] += a * comb(j + k, k)
+        arrangements = extended
+    return arrangements[r]
+
 # https://stackoverflow.com/a/6285330/2668831
 def uniquely_permute(iterable, enforce_sort=False, r=None):
-    previous = tuple()
+    """
+    Generate the permutations of `iterable` (of length `r`, if given) which are each
+    lexicographically greater than the last, i.e. for sorted input each unique
+    permutation of the multiset once in lexicographic order.
+
+    Sorted input (or `enforce_sort`) is permuted directly as a multiset rather than
+    by filtering all `len(iterable)!` permutations, which is only done to keep the
+    same output for unsorted input.
+    """
     if enforce_sort: # potential waste of effort (default: False)
         iterable = sorted(iterable)
+    else:
+        iterable = list(iterable)
+    if all(a <= b for a, b in zip(iterable, iterable[1:])):
+        if r == 0 or not iterable:
+            return # the empty arrangement is never greater than the initial `()`
+        if r is None:
+            yield from multiset_permutations(iterable)
+        else:
+            values = sorted(set(iterable))
+            counts = [iterable.count(v) for v in values]
+            yield from _multiset_r_permutations(values, counts, r)
+        return
+    previous = tuple()
     for p in permute(iterable, r):
         if p > previous:
             previous = p
@@ -88,7 +214,7 @@ def print_partitions_by_length(max_n, sorting=True, permuting=True):
         print()
     return
 
-def generate_powerset(items, subset_handler=tuple, verbose=False):
+def generate_powerset(items, subset_handler=tuple, verbose=False, cache_dir=None, stats=None):
     """
     Generate the powerset of an iterable `items`.
 
@@ -96,10 +222,23 @@ def generate_powerset(items, subset_handler=tuple, verbose=False):
     `subset_handler`, which must be able to handle the `None` value for the
     empty set. The function `string_handler` will join the elements of the subset
     with the empty string (useful when `items` is an iterable of `str` variables).
+
+    The partition table for `len(items)` is reused from an in-process cache, and is
+    memory-mapped from (or written to) a file in `cache_dir` if one is given.
+
+    Passing a `stats` object (an `instrumentation.PowersetStats`) records the counts
+    and timings per level and partition into it, on a separate instrumented loop
+    (so without `stats` this loop is not slowed down at all).
     """
+    if stats is not None:
+        assert not verbose, ValueError("Can't print subsets while instrumenting")
+        from ord_pset.instrumentation import instrumented_powerset
+        return instrumented_powerset(items, subset_handler, stats, cache_dir=cache_dir)
+    # deferred import: `partition_cache` builds its tables with this module
+    from ord_pset.partition_cache import cached_partitions_by_length
     ps = {0: [subset_handler()]}
     n = len(items)
-    p_dict = partitions_by_length(n-1, sorting=True, permuting=True)
+    p_dict = cached_partitions_by_length(n-1, cache_dir=cache_dir)
     for p_len, parts in p_dict.items():
         ps.setdefault(p_len, [])
         if p_len == 0:
@@ -116,9 +255,9 @@ def generate_powerset(items, subset_handler=tuple, verbose=False):
                 ps.get(p_len).append(subset)
         for pcount, partition in enumerate(parts):
             distance = sum(partition)
-            indices = (cumsum(partition)).tolist()
+            indices = list(accumulate(partition))
             for offset in range(n - distance):
-                subset = subset_handler([items[offset]] + [items[offset:][i] for i in indices])
+                subset = subset_handler([items[offset]] + [items[offset + i] for i in indices])
                 if verbose:
                     if offset > 0:
                         print(end=" ")
@@ -131,9 +270,149 @@ def generate_powerset(items, subset_handler=tuple, verbose=False):
             print()
     return ps
 
+def iter_level_partitions(n, p_len):
+    """
+    Generate the (permuted) partitions used as templates for the subsets of size
+    `p_len + 1` in the powerset of `n` items, in the same order as the sorted and
+    permuted values of `partitions_by_length(n-1)[p_len]` (i.e. by sum, then by
+    minimum, then in lexicographic order) but without building the table.
+    """
+    for distance in range(p_len, n):
+        for asc_partition in asc_partitions_of_length(distance, p_len):
+            yield from uniquely_permute(asc_partition)
+
+def next_level_partition(partition, n):
+    """
+    Return the (permuted) partition which follows `partition` in the order of
+    `iter_level_partitions(n, len(partition))`, or None if it is the last of its
+    level: its next unique permutation, else the next ascending partition of the
+    same sum, else the first partition of the next sum (while less than `n`).
+    """
+    a = list(partition)
+    if next_permutation(a):
+        return tuple(a)
+    a.reverse() # the last permutation is non-increasing
+    if _next_asc_partition(a):
+        return tuple(a)
+    distance, p_len = sum(a) + 1, len(a)
+    if distance < n:
+        return (1,) * (p_len - 1) + (distance - p_len + 1,)
+    return None
+
+def iter_powerset(items, subset_handler=tuple, max_size=None, max_span=None,
+    include=(), exclude=()):
+    """
+    Lazily generate the powerset of `items` in the same order as the levels of
+    `generate_powerset` (flattened), without holding more than the partitions of
+    the current level and sum in memory at any time.
+
+    The `subset_handler` is called as in `generate_powerset` (with no argument for
+    the empty set, and with a list of items otherwise).
+
+    The subsets can be restricted to those of at most `max_size` items, with a span
+    (last minus first item position, i.e. the partition sum) of at most `max_span`,
+    containing all of the items in `include` (so none if any of them is not in
+    `items`), and none of those in `exclude`. These constraints prune whole levels, sums and offset ranges before any subset is made.
+    """
+    n = len(items)
+    max_size = n if max_size is None else max_size
+    max_span = n - 1 if max_span is None else max_span
+    positions = {item: i for i, item in enumerate(items)} if include or exclude else {}
+    included = [positions.get(x) for x in include]
+    if None in included:
+        return # no subset of `items` contains an item not in `items`
+    included.sort()
+    # excluding an item not in `items` excludes nothing
+    excluded = frozenset(positions[x] for x in exclude if x in positions)
+    if not included:
+        yield subset_handler()
+    if max_size >= 1 and len(included) <= 1:
+        for offset in included or range(n):
+            if offset not in excluded:
+                yield subset_handler([items[offset]])
+    min_span = included[-1] - included[0] if included else 0
+    for p_len in range(max(1, len(included) - 1), min(n, max_size)):
+        for distance in range(max(p_len, min_span), min(n, max_span + 1)):
+            for asc_partition in asc_partitions_of_length(distance, p_len):
+                for partition in uniquely_permute(asc_partition):
+                    indices = (0, *accumulate(partition))
+                    if included:
+                        offsets = _including_offsets(indices, included, n - distance)
+                    else:
+                        offsets = range(n - distance)
+                    for offset in offsets:
+                        if excluded and any(offset + i in excluded for i in indices):
+                            continue
+                        yield subset_handler([items[offset + i] for i in indices])
+
+def _including_offsets(indices, included, run):
+    """
+    Return the offsets in `range(run)` (ascending) at which the cumulative
+    `indices` of a partition cover all of the `included` item positions: the first
+    of these must be at one of the indices, so there are at most `len(indices)`.
+    """
+    index_set = set(indices)
+    offsets = []
+    for i in reversed(indices):
+        offset = included[0] - i
+        if 0 <= offset < run and all(j - offset in index_set for j in included):
+            offsets.append(offset)
+    return offsets
+
+def iter_powerset_from(items, start=0, subset_handler=tuple):
+    """
+    Lazily generate the powerset of `items` in the order of `iter_powerset` from
+    the subset at index `start` on, which is found by unranking (counting) rather
+    than by generating the subsets before it, so the cost of taking the next `k`
+    subsets is proportional to `k` (plus a polynomial in `n`) rather than `start`.
+    """
+    from ord_pset.ranking import unrank
+    n = len(items)
+    if start >= 2**n:
+        return
+    subset = unrank(n, start)
+    if not subset:
+        yield subset_handler()
+        subset = (0,)
+    if len(subset) == 1:
+        for offset in range(subset[0], n):
+            yield subset_handler([items[offset]])
+        if n < 2:
+            return
+        subset = (0, 1)
+    partition = tuple(b - a for a, b in zip(subset, subset[1:]))
+    offset = subset[0]
+    while partition is not None:
+        distance = sum(partition)
+        indices = (0, *accumulate(partition))
+        for o in range(offset, n - distance):
+            yield subset_handler([items[o + i] for i in indices])
+        offset = 0
+        p_len = len(partition)
+        partition = next_level_partition(partition, n)
+        if partition is None and p_len + 1 < n:
+            partition = (1,) * (p_len + 1) # the first partition of the next level
+    return
+
+def take(items, k, start=0, subset_handler=tuple):
+    """
+    Return a list of the first `k` subsets of the powerset of `items` (from index
+    `start`) in the order of `iter_powerset`, generating only those subsets.
+    """
+    return list(islice(iter_powerset_from(items, start, subset_handler), k))
+
 def string_handler(x=None):
     if x is None:
         t = tuple()
     else:
         t = tuple(x)
     return "".join(t)
+
+def bitmask_handler(x=None):
+    """
+    Return the integer bitmask of a subset of item indices (i.e. when `items` is
+    `range(n)`), with item `i` as bit `i` (by `bitmasks.indices_to_bitmask`). The
+    empty set is the zero mask. For bulk output use `ord_pset.bitmasks`, which
+    shifts whole runs of masks at once.
+    """
+    return indices_to_bitmask(() if x is None else x)
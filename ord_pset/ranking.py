@@ -0,0 +1,185 @@
+from ord_pset.partition_counts import composition_count, multinomial
+from math import comb
+
+# Random access into the ordered powerset of `n` items (in the order of
+# `generate_powerset`/`iter_powerset`), where subsets are given as ascending
+# tuples of item indices. The order is built up from:
+#   - the empty set (rank 0) then the singletons (ranks 1 to n)
+#   - for each level (the number of parts in the partition, i.e. subset size - 1)
+#     - for each distance (the partition sum, i.e. last index - first index)
+#       - for each ascending partition (in lexicographic order)
+#         - for each unique permutation of it (in lexicographic order)
+#           - for each offset (the first index) in `range(n - distance)`
+# so every run can be skipped over by counting rather than enumerating it. Within
+# a distance, ascending partitions are grouped by their smallest part `v` and then
+# by the multiplicity `c` of that part (in lexicographic order more copies of `v`
+# come first), each group being counted as `comb(p_len, c)` times the count of the
+# compositions of what remains (all of whose parts must exceed `v`).
+
+def part_counts(partition):
+    "Return the sorted distinct values of `partition` and their counts"
+    values = sorted(set(partition))
+    return values, [partition.count(v) for v in values]
+
+def _level_start(n, p_len):
+    "Rank of the first subset at level `p_len` (i.e. of size `p_len + 1`)"
+    return sum(comb(n, j) for j in range(p_len + 1))
+
+def _unrank_composition(distance, p_len, k):
+    """
+    Return the ascending partition and its permutation rank for the `k`-th of the
+    compositions of `distance` into `p_len` parts, in the order of the ascending
+    partitions (lexicographic), each expanded into its unique permutations.
+    """
+    parts = []
+    scale = 1 # product of the binomials of multiplicities chosen so far
+    lowest = 1
+    while p_len:
+        v = lowest
+        while True:
+            v_count = scale * (
+                composition_count(distance, p_len, v)
+                - composition_count(distance, p_len, v + 1)
+            )
+            if k < v_count:
+                break
+            k -= v_count
+            v += 1
+        for c in range(p_len, 0, -1):
+            c_count = scale * comb(p_len, c) * composition_count(distance - c * v, p_len - c, v + 1)
+            if k < c_count:
+                break
+            k -= c_count
+        parts.extend([v] * c)
+        scale *= comb(p_len, c)
+        distance -= c * v
+        p_len -= c
+        lowest = v + 1
+    return tuple(parts), k
+
+def _rank_composition(asc_partition):
+    """
+    Return the position of the first permutation of `asc_partition` among all of
+    the compositions of its sum with as many parts (the inverse of the partition
+    lookup in `_unrank_composition`).
+    """
+    distance, p_len = sum(asc_partition), len(asc_partition)
+    values, counts = part_counts(asc_partition)
+    k = 0
+    scale = 1
+    lowest = 1
+    for v, c in zip(values, counts):
+        k += scale * (
+            composition_count(distance, p_len, lowest)
+            - composition_count(distance, p_len, v)
+        )
+        for more in range(p_len, c, -1):
+            k += scale * comb(p_len, more) * composition_count(distance - more * v, p_len - more, v + 1)
+        scale *= comb(p_len, c)
+        distance -= c * v
+        p_len -= c
+        lowest = v + 1
+    return k
+
+def unrank_permutation(values, counts, k):
+    "Return the `k`-th unique permutation (in lexicographic order) of a multiset"
+    counts = list(counts)
+    remaining = sum(counts)
+    perms = multinomial(counts)
+    perm = []
+    while remaining:
+        for i, v in enumerate(values):
+            if not counts[i]:
+                continue
+            with_v = perms * counts[i] // remaining
+            if k < with_v:
+                perm.append(v)
+                counts[i] -= 1
+                remaining -= 1
+                perms = with_v
+                break
+            k -= with_v
+    return tuple(perm)
+
+def rank_permutation(values, counts, perm):
+    "Return the lexicographic rank of `perm` among the unique permutations of a multiset"
+    counts = list(counts)
+    remaining = sum(counts)
+    perms = multinomial(counts)
+    k = 0
+    for x in perm:
+        for i, v in enumerate(values):
+            if not counts[i]:
+                continue
+            with_v = perms * counts[i] // remaining
+            if v == x:
+                counts[i] -= 1
+                remaining -= 1
+                perms = with_v
+                break
+            k += with_v
+    return k
+
+def unrank(n, k):
+    """
+    Return the `k`-th subset of the ordered powerset of `n` items as an ascending
+    tuple of item indices, without generating any of the preceding subsets.
+
+    Whole levels, distances and groups of partitions are skipped by counting
+    (binomials), so the cost is polynomial in `n` rather than proportional to `k`.
+    """
+    assert isinstance(n, int) and n >= 0, ValueError("n must be a non-negative integer")
+    assert 0 <= k < 2**n, IndexError(f"Rank {k} out of range for the powerset of {n} items")
+    if k == 0:
+        return ()
+    if k <= n:
+        return (k - 1,)
+    k -= n + 1
+    p_len = 1
+    while k >= comb(n, p_len + 1):
+        k -= comb(n, p_len + 1)
+        p_len += 1
+    for distance in range(p_len, n):
+        run = n - distance
+        d_count = run * comb(distance - 1, p_len - 1)
+        if k < d_count:
+            break
+        k -= d_count
+    c_rank, offset = divmod(k, run)
+    asc_partition, p_rank = _unrank_composition(distance, p_len, c_rank)
+    values, counts = part_counts(asc_partition)
+    partition = unrank_permutation(values, counts, p_rank)
+    subset = [offset]
+    for part in partition:
+        subset.append(subset[-1] + part)
+    return tuple(subset)
+
+def rank(subset, n):
+    """
+    Return the position of `subset` (an ascending tuple of item indices) in the
+    ordered powerset of `n` items, i.e. the inverse of `unrank(n, k)`.
+    """
+    subset = tuple(subset)
+    assert all(a < b for a, b in zip(subset, subset[1:])), ValueError(
+        "subset must be a strictly ascending sequence of indices"
+    )
+    assert not subset or (0 <= subset[0] and subset[-1] < n), IndexError(
+        f"subset {subset} has indices out of range for {n} items"
+    )
+    if not subset:
+        return 0
+    if len(subset) == 1:
+        return subset[0] + 1
+    p_len = len(subset) - 1
+    partition = tuple(b - a for a, b in zip(subset, subset[1:]))
+    offset = subset[0]
+    distance = subset[-1] - offset
+    run = n - distance
+    k = _level_start(n, p_len)
+    for d in range(p_len, distance):
+        k += (n - d) * comb(d - 1, p_len - 1)
+    target = tuple(sorted(partition))
+    values, counts = part_counts(target)
+    c_rank = _rank_composition(target) + rank_permutation(values, counts, partition)
+    k += c_rank * run + offset
+    return k
@@ -1,16 +1,109 @@
-from pset_partitions import generate_powerset, string_handler
+from ord_pset.pset_partitions import (
+    bitmask_handler, generate_powerset, iter_powerset_from, string_handler,
+)
+from array import array
+from itertools import islice
+from math import comb
 import argparse
+import json
+import os
+import sys
 
-parser = argparse.ArgumentParser()
-parser.add_argument("items_str", action="append", help="A string to" +
-    "be split as multiple items, or multiple space-separated strings, " +
-    "representing the set of items whose powerset is to be determined")
-parser.add_argument("-q", "--quiet", dest="verbose", action="store_false")
-args = parser.parse_args()
+# With `--format`, the powerset is streamed (without building the `generate_powerset`
+# dict) to stdout in chunks of `CHUNK_SIZE` subsets, each written in one call:
+#   - `lines`: one subset per line (its items joined, with spaces between them if
+#     the items were given as separate strings)
+#   - `jsonl`: one JSON list of items per line
+#   - `binary`: one little-endian 64-bit bitmask per subset (item `i` as bit `i`)
+# `--size` restricts the output to the subsets of that many items, starting directly
+# at the first of them, and `--limit` stops after that many subsets (either of which
+# without `--format` streams `lines`). N.B. a size is not a level: the levels of
+# `generate_powerset` (the blocks printed without `--format`) are the subsets of
+# size `p_len + 1`, with the empty set and singletons together at level 0.
 
-items = list(args.items_str)
+CHUNK_SIZE = 2**16
 
-if len(items) == 1:
-    items = list(items[0])
+def iter_subsets(items, subset_handler, size=None, limit=None):
+    "Generate the handled subsets of `items` (of `size` items, if given) in order"
+    n = len(items)
+    if size is None:
+        start, count = 0, 2**n
+    else:
+        start, count = sum(comb(n, j) for j in range(size)), comb(n, size)
+    if limit is not None:
+        count = min(count, limit)
+    return islice(iter_powerset_from(items, start, subset_handler), count)
 
-ps = generate_powerset(items, subset_handler=string_handler, verbose=args.verbose)
+def _line_handler(sep):
+    def handler(x=()):
+        return sep.join(x)
+    return handler
+
+def _jsonl_handler(x=()):
+    return json.dumps(x)
+
+def write_subsets(items, out, fmt="lines", size=None, limit=None, sep=""):
+    """
+    Write the powerset of `items` (or its subsets of `size` items, up to `limit` of
+    them) to the binary file `out` in the format `fmt`, one chunk at a time.
+    Return the number of subsets written.
+    """
+    assert fmt in ("lines", "jsonl", "binary"), ValueError(f"Unknown format: {fmt}")
+    if fmt == "binary":
+        assert len(items) <= 64, ValueError("Can't write bitmasks of more than 64 items")
+        subsets = iter_subsets(range(len(items)), bitmask_handler, size, limit)
+    else:
+        handler = _jsonl_handler if fmt == "jsonl" else _line_handler(sep)
+        subsets = iter_subsets(items, handler, size, limit)
+    written = 0
+    while True:
+        chunk = list(islice(subsets, CHUNK_SIZE))
+        if not chunk:
+            return written
+        if fmt == "binary":
+            words = array("Q", chunk)
+            if sys.byteorder != "little":
+                words.byteswap()
+            out.write(words.tobytes())
+        else:
+            out.write(("\n".join(chunk) + "\n").encode())
+        written += len(chunk)
+
+def _non_negative_int(value):
+    "Parse a `--size` or `--limit` argument (rejected by argparse if negative)"
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be non-negative: {number}")
+    return number
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("items_str", action="append", help="A string to" +
+        "be split as multiple items, or multiple space-separated strings, " +
+        "representing the set of items whose powerset is to be determined")
+    parser.add_argument("-q", "--quiet", dest="verbose", action="store_false")
+    parser.add_argument("--format", choices=["lines", "jsonl", "binary"],
+        help="Stream the subsets to stdout in this format (rather than printing the levels)")
+    parser.add_argument("--size", type=_non_negative_int, help="Only output the subsets of this many items")
+    parser.add_argument("--limit", type=_non_negative_int, help="Stop after this many subsets")
+    args = parser.parse_args()
+
+    items = list(args.items_str)
+    sep = " "
+
+    if len(items) == 1:
+        items = list(items[0])
+        sep = ""
+
+    if args.format is None and (args.size is not None or args.limit is not None):
+        args.format = "lines"
+
+    if args.format is None:
+        ps = generate_powerset(items, subset_handler=string_handler, verbose=args.verbose)
+    else:
+        try:
+            write_subsets(items, sys.stdout.buffer, args.format, args.size, args.limit, sep)
+            sys.stdout.buffer.flush()
+        except BrokenPipeError:
+            # the reader went away (e.g. `| head`): silence the flush at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
@@ -0,0 +1,59 @@
+from ord_pset.aio import aiter_powerset
+from ord_pset.pset_partitions import iter_powerset, string_handler
+import asyncio
+
+
+async def collect(items, **kwargs):
+    batches = []
+    async for batch in aiter_powerset(items, **kwargs):
+        batches.append(batch)
+    return batches
+
+
+def test_aiter_powerset_batches():
+    items = "abcdefgh"
+    expected = list(iter_powerset(items, string_handler))
+    for threaded in (False, True):
+        batches = asyncio.run(collect(items, batch_size=10, subset_handler=string_handler,
+            threaded=threaded))
+        assert all(len(b) == 10 for b in batches[:-1]) and 0 < len(batches[-1]) <= 10
+        assert [s for b in batches for s in b] == expected
+    batches = asyncio.run(collect(items, batch_size=100, threaded=True, max_size=2))
+    assert [s for b in batches for s in b] == list(iter_powerset(items, max_size=2))
+    return
+
+
+def test_aiter_powerset_backpressure():
+    async def run():
+        produced = []
+        def handler(x=None):
+            produced.append(x)
+            return x
+        # stop after 2 batches of a huge powerset: the producer must stop too
+        n_seen = 0
+        async for batch in aiter_powerset(range(40), batch_size=5, subset_handler=handler,
+            threaded=True, max_pending=2):
+            n_seen += 1
+            if n_seen == 2:
+                break
+        await asyncio.sleep(0.05)
+        return len(produced)
+    # at most the consumed, queued, blocked and one in-progress batches
+    assert asyncio.run(run()) <= 5 * (2 + 2 + 2)
+    return
+
+
+def test_aiter_powerset_yields_to_loop():
+    async def run():
+        ticks = []
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+        task = asyncio.create_task(ticker())
+        n_batches = len(await collect(range(10), batch_size=64))
+        task.cancel()
+        return n_batches, len(ticks)
+    n_batches, n_ticks = asyncio.run(run())
+    assert n_ticks >= n_batches - 1
+    return
@@ -1,4 +1,21 @@
-from ord_pset.bit_strings import bitstream_ins
+from subprocess import run
+import sys
+
+import numpy as np
+
+from ord_pset.bit_strings import (
+    Bits,
+    BitStream,
+    RangeBitstreamCache,
+    bitstr_len,
+    bitstream_ins,
+    insert_into_bitstream,
+    iter_bitstream_ints,
+    iter_codewords,
+    pack_codewords,
+    toggle_bitstream,
+)
+from ord_pset.pset_partitions import generate_powerset
 from ord_pset.tests.data.bit_strings_target_values import (
     binstream_lossless_targets,
     binstream_lencode_targets,
@@ -34,3 +51,138 @@ def test_bitstream_ins_fixed_len():
             f"Result {n} did not match target string: {binval} ≠ {binstream_fixed_len_targets[n]}"
         )
     return
+
+
+def inserted_bitstream(values, lengths):
+    "Reference encoding by one `BitStream.insert` per codeword"
+    bs = BitStream()
+    for b, l in zip(values, lengths):
+        insert_into_bitstream(bs, b, l)
+    return bs
+
+
+def test_bitstream_ins_iterable_modes():
+    values = [1, 2, 3, 4, 12, 23, 34, 13, 24, 14, 123, 234, 124, 134, 1234, 0, 5]
+    lossless = bitstream_ins(values)
+    assert lossless.bin == inserted_bitstream(values, map(bitstr_len, values)).bin
+    fixed = bitstream_ins(values, fixed_length=True)
+    assert fixed.bin == inserted_bitstream(values, [11] * len(values)).bin
+    assert bitstream_ins(list(range(300)), lencode=True).bin == bitstream_ins(n=300, lencode=True).bin
+    return
+
+
+def test_bitstream_ins_bstream_and_raw():
+    gen = [[1, 2, 3, 4], [12, 23, 34, 13, 24, 14], [123, 234, 124, 134], [1234]]
+    bs = BitStream()
+    for g in gen:
+        bitstream_ins(g, bstream=bs)
+    assert bs.bin == "".join(bitstream_ins(g).bin for g in gen)
+    packed, nbits = bitstream_ins(n=9, raw=True)
+    assert nbits == 22 and BitStream(bytes=bytes(packed), length=nbits).bin == binstream_lossless_targets[9]
+    return
+
+
+def test_bitstream_ins_numpy_arrays():
+    values = np.array([0, 1, 5, 2, 9, 1000, 3, 2**40 + 7, 6, 14, 15, 31], dtype=np.uint64)
+    for kwargs in [{}, {"fixed_length": True}, {"lencode": True}]:
+        if kwargs.get("lencode"):
+            values.sort() # lencoding needs non-decreasing codeword lengths
+        target = bitstream_ins(values.tolist(), **kwargs)
+        result = bitstream_ins(values, **kwargs)
+        assert result.bin == target.bin, ValueError(f"Array encoding differs for {kwargs}")
+    big = np.arange(70000)
+    assert bitstream_ins(big).bin == bitstream_ins(n=70000).bin
+    assert bitstream_ins(big, lencode=True).bin == bitstream_ins(n=70000, lencode=True).bin
+    return
+
+
+def test_bitstream_ins_numpy_verbose(capsys):
+    for kwargs in [{}, {"fixed_length": True}, {"lencode": True}]:
+        target = bitstream_ins([1, 2, 6], **kwargs)
+        result = bitstream_ins(np.array([1, 2, 6]), v=True, **kwargs)
+        assert result.bin == target.bin, ValueError(f"Verbose array encoding differs for {kwargs}")
+    assert "Inserting" in capsys.readouterr().out
+    return
+
+
+def test_iter_bitstream_ints_range_modes():
+    for mode in [{}, {"lencode": True}, {"fixed_length": True}]:
+        for n in [0, 1, 2, 3, 6, 9, 64, 1000]:
+            kwargs = dict(mode)
+            bs = bitstream_ins(n=n, **kwargs)
+            decoded = [x for chunk in iter_bitstream_ints(bs, n=n, **kwargs) for x in chunk]
+            assert decoded == list(range(n)), ValueError(f"Decoding failed: {kwargs}, n={n}")
+            packed, nbits = bitstream_ins(n=n, raw=True, **kwargs)
+            if "fixed_length" in kwargs:
+                kwargs["width"] = bitstr_len(n - 1) if n > 2 else 1
+            from_bytes = iter_bitstream_ints(memoryview(packed), nbits=nbits, **kwargs)
+            assert [x for chunk in from_bytes for x in chunk] == list(range(n))
+    return
+
+
+def test_iter_bitstream_ints_file_chunks(tmp_path):
+    values = [5, 0, 17, 1023, 2, 999]
+    packed, nbits = bitstream_ins(values, fixed_length=True, raw=True)
+    path = tmp_path / "stream.bin"
+    path.write_bytes(packed)
+    with open(path, "rb") as f:
+        chunks = list(iter_bitstream_ints(f, fixed_length=True, width=10, n=6, chunk_size=4, read_size=3))
+    assert chunks == [values[:4], values[4:]]
+    return
+
+
+def test_toggle_bitstream():
+    for n in range(1, 9):
+        ps = generate_powerset(list(range(n)))
+        bs = BitStream()
+        level_offsets = [0]
+        for p_len, subsets in ps.items():
+            for subset in subsets[1:] if p_len == 0 else subsets:
+                bs.insert(Bits([i in subset for i in range(n)]))
+            level_offsets.append(bs.len)
+        toggles, offsets = toggle_bitstream(n)
+        assert toggles.bin == bs.bin, ValueError(f"Toggle bitstream differs for n={n}")
+        assert offsets == level_offsets
+        (packed, nbits), offsets = toggle_bitstream(n, empty=True, raw=True)
+        assert nbits == n * 2**n and offsets[-1] == nbits
+        assert BitStream(bytes=bytes(packed), length=nbits).bin == "0" * n + bs.bin
+    return
+
+
+def test_bitstring_imported_lazily():
+    code = (
+        "import sys, ord_pset.bit_strings as b; b.bitstream_ins(n=9, raw=True);"
+        "print('bitstring' in sys.modules); b.BitStream; print('bitstring' in sys.modules)"
+    )
+    result = run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    assert result == ["False", "True"]
+    return
+
+
+def test_range_bitstream_cache():
+    cache = RangeBitstreamCache()
+    modes = [{}, {"lencode": True}, {"fixed_length": True}]
+    held = []
+    for n in [5, 3, 0, 1, 2, 17, 16, 100, 1000, 999, 4097, 3, 9]:
+        for mode in modes:
+            view, nbits = cache.get(n, **mode)
+            assert isinstance(view, memoryview)
+            packed, target_nbits = bitstream_ins(n=n, raw=True, **mode)
+            assert nbits == target_nbits
+            assert Bits(bytes=bytes(view), length=nbits) == Bits(bytes=bytes(packed), length=nbits)
+            held.append((view, nbits, packed))
+    # views handed out earlier stay valid (and unchanged) as the cache grows
+    for view, nbits, packed in held:
+        assert Bits(bytes=bytes(view), length=nbits) == Bits(bytes=bytes(packed), length=nbits)
+    for n, target in enumerate(binstream_lossless_targets):
+        view, nbits = cache.get(n)
+        assert Bits(bytes=bytes(view), length=nbits).bin == target
+    return
+
+
+def test_iter_codewords():
+    values = [0, 1, 2, 5, 6, 13, 14, 40]
+    for kwargs, width in [({}, None), ({"lencode": True}, None), ({"fixed_length": True}, 6)]:
+        packed = pack_codewords(iter_codewords(values, width, kwargs.get("lencode", False)))
+        assert packed == bitstream_ins(values, raw=True, **kwargs)
+    return
@@ -0,0 +1,27 @@
+from ord_pset.bitmasks import bitmask_array, bitmask_to_indices, iter_bitmasks
+from ord_pset.pset_partitions import bitmask_handler, generate_powerset, iter_powerset
+
+
+def test_bitmasks_match_iter_powerset():
+    for n in range(10):
+        target = list(iter_powerset(range(n)))
+        result = [bitmask_to_indices(mask) for mask in iter_bitmasks(n)]
+        assert result == target, ValueError(f"Bitmask order differs for n={n}")
+        ps = generate_powerset(range(n), subset_handler=bitmask_handler)
+        assert [m for masks in ps.values() for m in masks] == list(iter_bitmasks(n))
+    return
+
+
+def test_bitmask_array():
+    n = 8
+    packed = bitmask_array(n)
+    assert packed.typecode == "Q" and packed.itemsize == 8
+    assert packed.tolist() == list(iter_bitmasks(n))
+    assert bitmask_array(n, p_len=1).tolist() == [0b11 << o for o in range(7)] + [
+        0b101 << o for o in range(6)
+    ] + [0b1001 << o for o in range(5)] + [0b10001 << o for o in range(4)] + [
+        0b100001 << o for o in range(3)
+    ] + [0b1000001 << o for o in range(2)] + [0b10000001]
+    assert bitmask_array(n, as_numpy=True).tolist() == packed.tolist()
+    assert bitmask_array(65, p_len=0)[-1] == 1 << 64
+    return
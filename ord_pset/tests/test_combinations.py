@@ -0,0 +1,18 @@
+from ord_pset.combinations import iter_ordered_combinations, max_diff_min, ordered_combinations
+from itertools import combinations
+
+
+def test_ordered_combinations_matches_sort():
+    for n in range(9):
+        for r in range(n + 2):
+            expected = sorted(combinations(range(n), r), key=max_diff_min)
+            assert ordered_combinations(range(n), r) == expected
+    return
+
+
+def test_ordered_combinations_items():
+    assert list(iter_ordered_combinations("abcd", 2)) == [
+        ("a", "b"), ("b", "c"), ("c", "d"), ("a", "c"), ("b", "d"), ("a", "d")
+    ]
+    assert ordered_combinations("abc", 1) == [("a",), ("b",), ("c",)]
+    return
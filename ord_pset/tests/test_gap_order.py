@@ -0,0 +1,32 @@
+from ord_pset.gap_order import iter_gap_ordered_powerset, iter_gap_sequences, lexsort_gap_order
+from ord_pset.more_itertools_ps_sort import ps_sorter
+from ord_pset.pset_partitions import string_handler
+from itertools import combinations
+from more_itertools import powerset
+import numpy as np
+
+
+def test_gap_order_matches_ps_sorter():
+    for n in range(9):
+        expected = sorted(powerset(range(n)), key=ps_sorter)
+        assert list(iter_gap_ordered_powerset(range(n))) == expected
+    assert list(iter_gap_ordered_powerset("abcd", string_handler))[:7] == [
+        "", "a", "b", "c", "d", "ab", "bc"
+    ]
+    return
+
+
+def test_gap_sequences():
+    assert list(iter_gap_sequences(4, 3)) == [(1, 1), (1, 2), (2, 1)]
+    assert list(iter_gap_sequences(4, 1)) == []
+    assert list(iter_gap_sequences(4, 5)) == []
+    return
+
+
+def test_lexsort_gap_order():
+    n = 7
+    for r in range(1, n + 1):
+        block = np.array(list(combinations(range(n), r)))
+        expected = sorted(combinations(range(n), r), key=ps_sorter)
+        assert list(map(tuple, lexsort_gap_order(block).tolist())) == expected
+    return
@@ -0,0 +1,30 @@
+import numpy as np
+
+from ord_pset.index_blocks import iter_index_blocks
+from ord_pset.pset_partitions import iter_powerset
+
+
+def flatten_blocks(blocks):
+    return [tuple(row.tolist()) for p_len, block in blocks for row in block]
+
+
+def test_index_blocks_match_iter_powerset():
+    for n in range(9):
+        target = list(iter_powerset(range(n)))[1:]
+        for by in ("level", "partition"):
+            result = flatten_blocks(iter_index_blocks(n, by=by))
+            assert result == target, ValueError(f"Blocks by {by} differ for n={n}")
+        for block_size in (1, 3, 7, 100):
+            blocks = list(iter_index_blocks(n, block_size=block_size))
+            assert all(len(block) <= block_size for p_len, block in blocks)
+            assert flatten_blocks(blocks) == target
+    return
+
+
+def test_membership_blocks():
+    n = 6
+    target = list(iter_powerset(range(n)))[1:]
+    rows = np.concatenate([b for l, b in iter_index_blocks(n, membership=True)])
+    assert rows.shape == (2**n - 1, n) and rows.dtype == bool
+    assert [tuple(np.flatnonzero(row).tolist()) for row in rows] == target
+    return
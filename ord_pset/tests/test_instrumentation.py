@@ -0,0 +1,41 @@
+from ord_pset.instrumentation import PowersetStats
+from ord_pset.partition_counts import level_counts
+from ord_pset.pset_partitions import generate_powerset, string_handler
+
+
+def test_stats_match_output():
+    for n in range(8):
+        items = "abcdefgh"[:n]
+        stats = PowersetStats()
+        ps = generate_powerset(items, string_handler, stats=stats)
+        assert ps == generate_powerset(items, string_handler)
+        assert [stats.levels[p_len]["subsets"] for p_len in sorted(stats.levels)] == list(level_counts(n))
+        assert sum(stats.partitions.values()) == 2**n
+        totals = stats.summary()
+        assert totals["subsets"] == 2**n and totals["peak_bytes"] is None
+        assert 0 <= totals["handler_seconds"] <= totals["total_seconds"]
+    assert stats.partitions[(1, 2)] == 4 and stats.partitions[()] == 8
+    return
+
+
+def test_stats_allocations():
+    stats = PowersetStats(trace_allocations=True)
+    generate_powerset(list(range(10)), stats=stats)
+    assert stats.peak_bytes > 0
+    assert all(level["peak_bytes"] is not None for level in stats.levels.values())
+    return
+
+
+def test_stats_subclass_hook():
+    class PartitionLog(PowersetStats):
+        def __init__(self):
+            super().__init__()
+            self.log = []
+
+        def record_partition(self, p_len, partition, subsets, *seconds):
+            super().record_partition(p_len, partition, subsets, *seconds)
+            self.log.append((p_len, partition, subsets))
+    stats = PartitionLog()
+    generate_powerset("abcd", string_handler, stats=stats)
+    assert stats.log[:3] == [(0, (), 5), (1, (1,), 3), (1, (2,), 2)]
+    return
@@ -0,0 +1,70 @@
+from io import BytesIO
+
+import numpy as np
+
+from ord_pset.bit_strings import BitStream, bitstream_ins, join_bit_pieces, pack_codewords
+from ord_pset.bitmasks import bitmask_array
+from ord_pset.parallel import (
+    bitstream_ins_parallel,
+    iter_powerset_parallel,
+    plan_shards,
+    write_bitmasks_parallel,
+)
+from ord_pset.pset_partitions import generate_powerset, iter_powerset, string_handler
+
+
+def test_plan_shards_balanced():
+    n = 10
+    shards = plan_shards(n, 8)
+    assert sum(count for count, runs in shards) == 2**n - 1
+    assert len(shards) <= 9
+    return
+
+
+def test_iter_powerset_parallel():
+    items = list("abcdefgh")
+    result = list(iter_powerset_parallel(items, string_handler, max_workers=2))
+    target = list(iter_powerset(items, string_handler))
+    assert result == target, ValueError("Parallel order differs from iter_powerset")
+    return
+
+
+def test_write_bitmasks_parallel():
+    n = 9
+    sink = BytesIO()
+    written = write_bitmasks_parallel(n, sink, max_workers=2)
+    assert written == 2**n
+    assert sink.getvalue() == bitmask_array(n).tobytes()
+    return
+
+
+def test_join_bit_pieces():
+    codewords = [(i % 2**(1 + i % 7), 1 + i % 7) for i in range(200)]
+    expected = pack_codewords(codewords)
+    for split in ([0, 200], [0, 1, 2, 3, 50, 51, 199, 200], list(range(0, 201, 7)) + [200]):
+        pieces = [pack_codewords(codewords[a:b]) for a, b in zip(split, split[1:])]
+        assert join_bit_pieces(pieces) == expected
+    assert join_bit_pieces([]) == (bytearray(), 0)
+    return
+
+
+def test_bitstream_ins_parallel():
+    ps = generate_powerset("123456", string_handler)
+    levels = [[int(s) for s in level if s] for level in ps.values()] # (without the empty set)
+    levels.append(range(1000))
+    levels.append(np.array([2000, 5, 77, 2**40, 3, 0]))
+    for mode in ({}, {"lencode": True}, {"fixed_length": True}):
+        bs = BitStream()
+        mode_levels = levels
+        if mode.get("lencode"):
+            mode_levels = [np.sort(l) if hasattr(l, "dtype") else sorted(l) for l in levels]
+        for level in mode_levels:
+            bitstream_ins(level, bstream=bs, **mode)
+        for chunk_size in (3, 64, 2**16):
+            result = bitstream_ins_parallel(mode_levels, max_workers=2, chunk_size=chunk_size, **mode)
+            assert result.bin == bs.bin
+    packed, nbits = bitstream_ins_parallel([range(100)], raw=True, max_workers=1)
+    assert (packed, nbits) == bitstream_ins(n=100, raw=True)
+    packed, nbits = bitstream_ins_parallel([np.arange(100)], raw=True, max_workers=1)
+    assert (packed, nbits) == bitstream_ins(n=100, raw=True)
+    return
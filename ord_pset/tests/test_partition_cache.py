@@ -0,0 +1,47 @@
+from ord_pset.partition_cache import (
+    MappedPartitionTable,
+    PartitionTableCache,
+    load_partition_table,
+    partition_table_path,
+)
+from ord_pset.pset_partitions import generate_powerset, partitions_by_length
+
+
+def test_cache_reuses_tables():
+    cache = PartitionTableCache()
+    table = cache.get(8)
+    assert cache.get(8) is table
+    assert table == {k: tuple(v) for k, v in partitions_by_length(8, permuting=True).items()}
+    return
+
+
+def test_cache_memory_bound():
+    small = PartitionTableCache()
+    small.get(6)
+    cache = PartitionTableCache(max_nbytes=small.nbytes * 6 // 5)
+    first = cache.get(6)
+    cache.get(5)
+    cache.get(4)
+    assert cache.nbytes <= cache.max_nbytes
+    assert cache.get(6) is not first # evicted as the least recently used
+    assert PartitionTableCache(max_nbytes=0).get(6) is not None
+    return
+
+
+def test_mapped_partition_table(tmp_path):
+    for max_n in range(1, 9):
+        table = load_partition_table(max_n, tmp_path)
+        assert isinstance(table, MappedPartitionTable)
+        target = partitions_by_length(max_n, sorting=True, permuting=True)
+        assert list(table) == list(target)
+        for k in target:
+            assert list(table[k]) == list(target[k])
+        assert partition_table_path(max_n, tmp_path).exists()
+    return
+
+
+def test_generate_powerset_cache_dir(tmp_path):
+    items = list("abcdefg")
+    assert generate_powerset(items, cache_dir=tmp_path) == generate_powerset(items)
+    assert partition_table_path(len(items) - 1, tmp_path).exists()
+    return
@@ -0,0 +1,54 @@
+from sys import getsizeof
+
+from ord_pset.partition_counts import (
+    comb_partition_counts,
+    comb_partitions,
+    distance_counts,
+    level_counts,
+    partition_counts,
+    predicted_nbytes,
+)
+from ord_pset.pset_partitions import generate_powerset, iter_level_partitions
+
+
+def test_level_counts():
+    for n in range(10):
+        ps = generate_powerset(list(range(n)))
+        target = tuple(len(subsets) for subsets in ps.values())
+        assert level_counts(n) == target, ValueError(f"Level counts wrong for n={n}")
+    return
+
+
+def test_distance_and_partition_counts():
+    for n in range(2, 10):
+        ps = generate_powerset(list(range(n)))
+        for p_len in range(1, n):
+            total = len(ps[p_len])
+            assert sum(c for d, c in distance_counts(n, p_len)) == total
+            assert sum(c for p, c in partition_counts(n, p_len)) == total
+            runs = [sorted(p) for p in iter_level_partitions(n, p_len)]
+            asc_order = [list(p) for p, c in partition_counts(n, p_len)]
+            assert [p for i, p in enumerate(runs) if p not in runs[:i]] == asc_order
+    return
+
+
+def test_comb_partition_counts():
+    assert comb_partitions(4) == [[[]], [[1], [2], [3]], [[1, 1], [2, 1]], [[1, 1, 1]]]
+    assert comb_partition_counts(4, multiplied=True) == [[], [3, 2, 1], [2, 2], [1]]
+    assert comb_partition_counts(4) == [[], [(3, 1), (2, 1), (1, 1)], [(2, 1), (1, 2)], [(1, 1)]]
+    # Sage order: `Partitions(10, length=4).list()` (reverse lexicographic)
+    assert comb_partitions(11)[4][-9:] == [
+        [7, 1, 1, 1], [6, 2, 1, 1], [5, 3, 1, 1], [5, 2, 2, 1], [4, 4, 1, 1],
+        [4, 3, 2, 1], [4, 2, 2, 2], [3, 3, 3, 1], [3, 3, 2, 2],
+    ]
+    return
+
+
+def test_predicted_nbytes():
+    for n in range(8):
+        ps = generate_powerset(list(range(n)))
+        target = sum(getsizeof(s) for subsets in ps.values() for s in subsets)
+        assert predicted_nbytes(n, "tuple") == target
+        assert predicted_nbytes(n, "toggle") == (n * 2**n + 7) // 8
+    assert predicted_nbytes(60, "bitmask") == 8 * 2**60
+    return
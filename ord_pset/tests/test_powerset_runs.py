@@ -0,0 +1,30 @@
+from ord_pset.powerset_runs import PowersetRuns
+from ord_pset.pset_partitions import iter_powerset, string_handler
+import pickle
+
+
+def test_powerset_runs_sequence():
+    for n in range(8):
+        items = list(range(n))
+        expected = list(iter_powerset(items))
+        runs = PowersetRuns(items)
+        assert len(runs) == len(expected) == 2**n
+        assert list(runs) == expected
+        assert [runs[i] for i in range(len(runs))] == expected
+        assert runs[-1] == expected[-1]
+        for start in range(len(expected)):
+            for stop in (start, start + 1, start + 5, len(expected)):
+                assert runs[start:stop] == expected[start:stop]
+        assert runs[1::3] == expected[1::3]
+    return
+
+
+def test_powerset_runs_compact():
+    runs = PowersetRuns("abcdefghijklmnopqrstuvwxyz1234", string_handler)
+    assert len(runs) == 2**30
+    assert len(runs.runs) < 10**5
+    assert runs[0] == "" and runs[1] == "a" and runs[31] == "ab"
+    assert runs[-1] == "abcdefghijklmnopqrstuvwxyz1234"
+    assert len(pickle.dumps(runs)) < 1024
+    assert pickle.loads(pickle.dumps(runs))[10**8] == runs[10**8]
+    return
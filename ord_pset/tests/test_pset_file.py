@@ -0,0 +1,51 @@
+import pytest
+
+from ord_pset.bitmasks import bitmask_array, bitmask_to_indices
+from ord_pset.pset_file import PowersetFile, write_pset_file
+from ord_pset.pset_partitions import generate_powerset, uniquely_permute
+
+
+def test_pset_file_round_trip(tmp_path):
+    for n in [0, 1, 5, 9, 17]:
+        path = tmp_path / f"pset_{n}.bin"
+        assert write_pset_file(path, n, write_size=100) == 2**n
+        with PowersetFile(path) as pf:
+            assert pf.n == n and len(pf) == 2**n
+            assert pf.words.tolist() == bitmask_array(n).tolist()
+    return
+
+
+def test_pset_file_levels_and_partitions(tmp_path):
+    n = 8
+    path = tmp_path / "pset.bin"
+    write_pset_file(path, n)
+    with PowersetFile(path) as pf:
+        ps = generate_powerset(range(n))
+        for p_len, subsets in ps.items():
+            with pf.level(p_len) as level:
+                assert [bitmask_to_indices(m) for m in level] == subsets
+                if len(level) >= 3:
+                    with pf.level(p_len, 1, 3) as part:
+                        assert part.tolist() == level.tolist()[1:3]
+        for asc_partition, start, stop in pf.partitions(p_len=3):
+            run = n - sum(asc_partition)
+            perms = list(uniquely_permute(asc_partition))
+            assert stop - start == run * len(perms)
+            first = bitmask_to_indices(pf[start])
+            assert tuple(b - a for a, b in zip(first, first[1:])) == perms[0]
+    return
+
+
+def test_pset_file_close(tmp_path):
+    path = tmp_path / "pset.bin"
+    write_pset_file(path, 4)
+    pf = PowersetFile(path)
+    view = pf.level(2)
+    with pytest.raises(BufferError): # a view of the mapping is still held
+        pf.close()
+    view.release()
+    pf.close()
+    pf.close() # closing twice is a no-op
+    assert pf._mmap.closed
+    path.unlink() # no mapping left holding the file open
+    return
@@ -0,0 +1,145 @@
+from itertools import chain, permutations
+from subprocess import run
+import sys
+
+from ord_pset.pset_partitions import (
+    asc_int_partitions,
+    asc_partitions_of_length,
+    count_unique_permutations,
+    generate_powerset,
+    iter_level_partitions,
+    iter_powerset,
+    iter_powerset_from,
+    next_level_partition,
+    string_handler,
+    take,
+    uniquely_permute,
+)
+
+
+def test_asc_partitions_of_length():
+    for n in range(1, 16):
+        for length in range(1, n + 1):
+            target = [p for p in asc_int_partitions(n) if len(p) == length]
+            result = list(asc_partitions_of_length(n, length))
+            assert result == target, ValueError(
+                f"Partitions of {n} into {length} parts did not match: {result} ≠ {target}"
+            )
+    return
+
+
+def test_iter_powerset_matches_generate_powerset():
+    for n in range(10):
+        items = list("abcdefghij"[:n])
+        ps = generate_powerset(items)
+        target = list(chain.from_iterable(ps.values()))
+        result = list(iter_powerset(items))
+        assert result == target, ValueError(f"Powerset order differs for n={n}")
+        assert len(result) == 2**n, ValueError(f"Wrong powerset size for n={n}")
+    return
+
+
+def test_iter_powerset_string_handler():
+    result = list(iter_powerset(list("abcd"), subset_handler=string_handler))
+    target = ["", "a", "b", "c", "d", "ab", "bc", "cd", "ac", "bd", "ad"]
+    target += ["abc", "bcd", "abd", "acd", "abcd"]
+    assert result == target, ValueError(f"{result} ≠ {target}")
+    return
+
+
+def filtered_permutations(iterable, r=None):
+    "The original `uniquely_permute`, filtering all permutations"
+    previous = tuple()
+    for p in permutations(iterable, r):
+        if p > previous:
+            previous = p
+            yield p
+
+
+def test_uniquely_permute_matches_filtering():
+    inputs = [(), (1,), (1, 1, 2), (1, 2, 2, 3), (1, 1, 1, 2, 2), (1, 2, 3, 4), (2, 1, 3), (3, 1, 1, 2)]
+    for p in inputs:
+        for r in [None, *range(len(p) + 2)]:
+            target = list(filtered_permutations(p, r))
+            assert list(uniquely_permute(p, r=r)) == target, ValueError(f"{p}, r={r}")
+            if list(p) == sorted(p) and target:
+                assert count_unique_permutations(p, r=r) == len(target)
+    assert list(uniquely_permute((2, 1, 3), enforce_sort=True)) == list(permutations((1, 2, 3)))
+    return
+
+
+def test_uniquely_permute_many_repeats():
+    p = (1,) * 9 + (2,)
+    result = list(uniquely_permute(p))
+    assert len(result) == count_unique_permutations(p) == 10
+    assert result[0] == p and result[-1] == (2,) + (1,) * 9
+    return
+
+
+def test_next_level_partition():
+    for n in range(2, 10):
+        for p_len in range(1, n):
+            partitions = list(iter_level_partitions(n, p_len))
+            successors = [next_level_partition(p, n) for p in partitions]
+            assert successors == partitions[1:] + [None], ValueError(f"n={n}, p_len={p_len}")
+    return
+
+
+def test_iter_powerset_filters():
+    items = "abcdefg"
+    full = list(iter_powerset(items, string_handler))
+    def check(**filters):
+        expected = [s for s in full if (
+            len(s) <= filters.get("max_size", len(items))
+            and (len(s) < 2 or items.index(s[-1]) - items.index(s[0]) <= filters.get("max_span", len(items)))
+            and all(x in s for x in filters.get("include", ()))
+            and not any(x in s for x in filters.get("exclude", ()))
+        )]
+        assert list(iter_powerset(items, string_handler, **filters)) == expected
+    check()
+    for k in range(len(items) + 1):
+        check(max_size=k)
+        check(max_span=k)
+        check(max_size=k, max_span=3, exclude="c")
+    for include in ["", "a", "d", "g", "bd", "ag", "ceg", "abcdefg"]:
+        check(include=include)
+        check(include=include, exclude="f", max_size=4)
+    check(include="a", exclude="a")
+    # items not in `items`: excluding one does nothing, including one leaves nothing
+    check(exclude="z")
+    check(exclude="cz", max_size=3)
+    check(include="z")
+    check(include="az", exclude="y")
+    assert list(iter_powerset(items, exclude="z")) == list(iter_powerset(items))
+    assert list(iter_powerset(items, include="z")) == []
+    return
+
+
+def test_iter_powerset_bounded_size_large_n():
+    items = list(range(2000))
+    subsets = list(iter_powerset(items, max_size=2, include=[1000]))
+    assert len(subsets) == 2000
+    assert subsets[0] == (1000,) and subsets[1:3] == [(999, 1000), (1000, 1001)]
+    return
+
+
+def test_take():
+    for n in range(7):
+        items = "abcdefg"[:n]
+        full = list(iter_powerset(items, string_handler))
+        for start in range(len(full) + 1):
+            assert list(iter_powerset_from(items, start, string_handler)) == full[start:]
+            assert take(items, 3, start, string_handler) == full[start:start + 3]
+    # only the subsets taken are generated, even deep into a huge powerset
+    items = list(range(60))
+    assert take(items, 2) == [(), (0,)]
+    assert take(items, 2, start=2**60 - 2) == [(0, *range(2, 60)), tuple(range(60))]
+    return
+
+
+def test_import_without_heavy_backends():
+    code = "import sys, ord_pset.pset_partitions; print(*sorted(sys.modules))"
+    loaded = run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    assert "ord_pset.pset_partitions" in loaded
+    assert not {"numpy", "bitstring", "more_itertools"} & set(loaded)
+    return
@@ -0,0 +1,28 @@
+from ord_pset.pset_partitions import iter_powerset
+from ord_pset.ranking import rank, unrank
+
+
+def test_unrank_matches_iter_powerset():
+    for n in range(10):
+        for k, subset in enumerate(iter_powerset(range(n))):
+            result = unrank(n, k)
+            assert result == subset, ValueError(
+                f"unrank({n}, {k}) gave {result} ≠ {subset}"
+            )
+    return
+
+
+def test_rank_inverts_unrank():
+    for n in range(10):
+        for k, subset in enumerate(iter_powerset(range(n))):
+            assert rank(subset, n) == k, ValueError(f"rank({subset}, {n}) ≠ {k}")
+    return
+
+
+def test_rank_unrank_large_n():
+    n = 45
+    for k in [10**12, 2**44 + 12345, 2**45 - 1]:
+        subset = unrank(n, k)
+        assert rank(subset, n) == k, ValueError(f"Round trip failed for k={k}")
+    assert unrank(n, 2**45 - 1) == tuple(range(n))
+    return
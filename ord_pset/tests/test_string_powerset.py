@@ -0,0 +1,54 @@
+from ord_pset.bitmasks import iter_bitmasks
+from ord_pset.pset_partitions import iter_powerset, string_handler
+from ord_pset.string_powerset import write_subsets
+from array import array
+from io import BytesIO
+from subprocess import run
+import json
+import sys
+
+
+def test_write_subsets_formats():
+    items = list("abcdef")
+    expected = list(iter_powerset(items, string_handler))
+    out = BytesIO()
+    assert write_subsets(items, out, "lines") == 64
+    assert out.getvalue().decode().split("\n") == expected + [""]
+    out = BytesIO()
+    write_subsets(items, out, "jsonl")
+    assert [json.loads(l) for l in out.getvalue().decode().splitlines()] == [list(s) for s in expected]
+    out = BytesIO()
+    write_subsets(items, out, "binary")
+    assert array("Q", out.getvalue()).tolist() == list(iter_bitmasks(6))
+    out = BytesIO()
+    write_subsets(["x", "yy", "z"], out, "lines", sep=" ")
+    assert out.getvalue().decode().splitlines()[-1] == "x yy z"
+    return
+
+
+def test_write_subsets_size_and_limit():
+    items = list("abcdef")
+    expected = list(iter_powerset(items, string_handler))
+    for size in range(7):
+        size_subsets = [s for s in expected if len(s) == size]
+        out = BytesIO()
+        write_subsets(items, out, "lines", size=size)
+        assert out.getvalue().decode().splitlines() == size_subsets
+        out = BytesIO()
+        assert write_subsets(items, out, "lines", size=size, limit=2) == min(2, len(size_subsets))
+    out = BytesIO()
+    write_subsets(items, out, "lines", limit=10)
+    assert out.getvalue().decode().split("\n") == expected[:10] + [""]
+    return
+
+
+def test_cli_rejects_negative_size_and_limit():
+    for option in ["--size", "--limit"]:
+        cmd = [sys.executable, "-m", "ord_pset.string_powerset", "abc", option, "-1"]
+        proc = run(cmd, capture_output=True, text=True)
+        assert proc.returncode == 2 and "must be non-negative" in proc.stderr
+        assert "Traceback" not in proc.stderr
+    proc = run([sys.executable, "-m", "ord_pset.string_powerset", "abc", "--size", "2"],
+        capture_output=True, text=True, check=True)
+    assert proc.stdout.split() == ["ab", "bc", "ac"]
+    return
@@ -0,0 +1,37 @@
+import pytest
+
+from ord_pset.bitmasks import iter_bitmasks
+from ord_pset.xor_delta import (
+    compression_report,
+    next_subset_mask,
+    xor_delta_decode,
+    xor_delta_encode,
+)
+
+
+def test_next_subset_mask():
+    for n in range(8):
+        masks = list(iter_bitmasks(n))
+        assert [next_subset_mask(m, n) for m in masks] == masks[1:] + [None]
+    return
+
+
+def test_xor_delta_round_trip():
+    for n in range(1, 10):
+        masks = list(iter_bitmasks(n))
+        bs = xor_delta_encode(masks, n)
+        assert list(xor_delta_decode(bs, n)) == masks, ValueError(f"Round trip failed for n={n}")
+    arbitrary = [0b101, 0b1, 0b111, 0b111, 0b1110, 0b0, 0b1000]
+    packed, nbits = xor_delta_encode(arbitrary, 4, raw=True)
+    assert list(xor_delta_decode(bytes(packed), 4, nbits=nbits)) == arbitrary
+    with pytest.raises(AssertionError): # a byte stream's padding needs `nbits`
+        list(xor_delta_decode(bytes(packed), 4))
+    return
+
+
+def test_compression_report():
+    report = compression_report(12)
+    assert report["subsets"] == 2**12
+    assert report["nbits"]["toggle"] == 12 * 2**12
+    assert report["ratio"]["toggle"] > 6
+    return
@@ -0,0 +1,103 @@
+from ord_pset.bit_strings import BitReader, bitstream_ins, is_bits, pack_codewords
+from ord_pset.bitmasks import bitmask_to_indices, indices_to_bitmask, iter_bitmasks
+from ord_pset.pset_partitions import next_level_partition
+from itertools import accumulate
+
+# Delta encoding of a stream of subset bitmasks (item `i` as bit `i`) against the
+# previous subset, with the cheapest of three codewords:
+#   - `0`: the previous mask shifted left by one (the next offset in a sweep)
+#   - `10`: the previous subset's successor in the ordered powerset (the start of
+#     the next partition's sweep, or of the next level)
+#   - `11` followed by the `n`-bit XOR of the mask with the previous mask
+# so the ordered powerset costs 1 or 2 bits per subset (as on average each sweep
+# is about 2 subsets long), while any other stream of subsets still round-trips.
+# The predecessor of the first mask is the empty set (mask 0).
+
+SHIFT, SUCCESSOR, XOR = (0, 1), (0b10, 2), (0b11, 2)
+
+def next_subset_mask(mask, n):
+    """
+    Return the bitmask of the subset which follows `mask` in the ordered powerset of
+    `n` items (as from `iter_bitmasks`), or None if it is the last subset.
+    """
+    if mask == 0:
+        return 1 if n else None
+    indices = bitmask_to_indices(mask)
+    if indices[-1] < n - 1:
+        return mask << 1
+    partition = tuple(b - a for a, b in zip(indices, indices[1:]))
+    if partition: # (a singleton is the last of its level when it is the last item)
+        partition = next_level_partition(partition, n)
+    if not partition:
+        p_len = len(indices)
+        if p_len >= n:
+            return None
+        partition = (1,) * p_len # the first partition of the next level
+    return indices_to_bitmask(accumulate(partition, initial=0))
+
+def _delta_codewords(masks, n):
+    "Generate the `(value, length)` codewords of the XOR-delta encoding of `masks`"
+    previous = 0
+    for mask in masks:
+        if mask == previous << 1:
+            yield SHIFT
+        elif mask == next_subset_mask(previous, n):
+            yield SUCCESSOR
+        else:
+            yield XOR
+            yield mask ^ previous, n
+        previous = mask
+
+def xor_delta_encode(masks, n, raw=False):
+    """
+    Encode an iterable of subset bitmasks (of `n` items) as XOR deltas against each
+    previous subset, returning a BitStream (or the raw `(bytearray, bit length)`
+    if `raw`). Decode with `xor_delta_decode`.
+    """
+    packed, nbits = pack_codewords(_delta_codewords(masks, n))
+    if raw:
+        return packed, nbits
+    from bitstring import BitStream
+    return BitStream(bytes=bytes(packed), length=nbits)
+
+def xor_delta_decode(source, n, nbits=None, read_size=2**16):
+    """
+    Generate the subset bitmasks (of `n` items) encoded by `xor_delta_encode` in the
+    bitstream `source` (bytes-like, a binary file or a `Bits`/`BitStream`, whose
+    length is used in place of `nbits` if not given), reading it incrementally.
+    """
+    if nbits is None and is_bits(source):
+        nbits = source.len
+    assert nbits is not None, ValueError("Must provide nbits")
+    reader = BitReader(source, read_size)
+    previous = 0
+    bits_left = nbits
+    while bits_left:
+        bits_left -= 1
+        if not reader.read(1):
+            mask = previous << 1
+        else:
+            bits_left -= 1
+            if not reader.read(1):
+                mask = next_subset_mask(previous, n)
+            else:
+                bits_left -= n
+                mask = previous ^ reader.read(n)
+        yield mask
+        previous = mask
+
+def compression_report(n):
+    """
+    Compare the size in bits of the ordered powerset of `n` items as XOR deltas
+    against its plain characteristic (toggle) vectors (`n` bits per subset) and the
+    `bitstream_ins` encoding of its bitmasks, returning the sizes and the ratios of
+    each to the XOR-delta size.
+    """
+    masks = list(iter_bitmasks(n))
+    sizes = {
+        "xor_delta": xor_delta_encode(masks, n, raw=True)[1],
+        "toggle": n * len(masks),
+        "bitstream_ins": bitstream_ins(masks, raw=True)[1],
+    }
+    ratios = {k: nbits / sizes["xor_delta"] for k, nbits in sizes.items()}
+    return {"subsets": len(masks), "nbits": sizes, "ratio": ratios}